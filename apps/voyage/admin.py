@@ -2,8 +2,17 @@
 admin.py
 """
 
-from django.utils.html import format_html
-from django.contrib import admin
+import codecs
+from urllib.parse import urlencode
+
+from django.utils.html import format_html, format_html_join
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.db.models import F
+from django.db.models.functions import NullIf
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 
 from .models import (
     Faculty,
@@ -13,7 +22,155 @@ from .models import (
     Student,
     Assignment,
     StudentAssignment,
+    StudentCourseRepo,
+    GradingQueueItem,
 )
+from .forms import StudentImportForm
+from .utils.aggregates import subquery_count
+from .utils.analytics import grade_array, grade_statistics
+from .utils.onboarding import import_students
+
+
+def filter_link(url, count, **params):
+    """
+    count linked to the changelist at url filtered by params, 0 when empty.
+    The link carries the parent ids only, never the ids of the rows.
+    """
+    if count:
+        return format_html('<a href="{}?{}">{}</a>', url, urlencode(params), count)
+    return 0
+
+
+class ParentFilter(admin.SimpleListFilter):
+    """
+    Filters the changelist to the children of one parent, ?<parameter_name>=id.
+    Only the selected parent is offered, so the filter costs one lookup and
+    is hidden when unused.
+    """
+
+    model = None
+    field = None
+    distinct = False
+
+    def lookups(self, request, model_admin):
+        """
+        The selected parent, labelled by its id when it does not exist
+        """
+        value = self.value()
+        if value is None:
+            return ()
+        parent = None
+        if value.isdigit():
+            parent = self.model.objects.filter(pk=value).first()
+        return [(value, str(parent or value))]
+
+    def queryset(self, request, queryset):
+        """
+        Rows whose field is the selected parent
+        """
+        value = self.value()
+        if value is None:
+            return queryset
+        if not value.isdigit():
+            raise IncorrectLookupParameters(f"{self.parameter_name} must be an id")
+        queryset = queryset.filter(**{self.field: value})
+        if self.distinct:
+            queryset = queryset.distinct()
+        return queryset
+
+
+class FullMarksFilter(admin.SimpleListFilter):
+    """
+    Submissions graded at or above the full marks of their assignment
+    """
+
+    title = "full marks"
+    parameter_name = "full_marks"
+
+    def lookups(self, request, model_admin):
+        """
+        Only full marks can be selected
+        """
+        return [("yes", "Yes")]
+
+    def queryset(self, request, queryset):
+        """
+        Compares each grade with its own assignment's threshold
+        """
+        if self.value() == "yes":
+            return queryset.filter(grade__gte=F("assignment__full_marks"))
+        return queryset
+
+
+def parent_filter(model, field, distinct=False):
+    """
+    ParentFilter on field, with the model name of model as parameter
+    """
+    return type(
+        f"{model.__name__}Filter",
+        (ParentFilter,),
+        {
+            "title": model._meta.verbose_name,
+            "parameter_name": model._meta.model_name,
+            "model": model,
+            "field": field,
+            "distinct": distinct,
+        },
+    )
+
+
+# Sorts changelists by the average their grade summary holds
+SUMMARY_AVG_ORDERING = F("grade_summary__grade_total") / NullIf(
+    F("grade_summary__num_graded"), 0
+)
+
+
+def summary_count(obj, name):
+    """
+    Count name from the grade summary of obj, 0 when it has none yet
+    """
+    summary = getattr(obj, "grade_summary", None)
+    if summary is None:
+        return 0
+    return getattr(summary, name)
+
+
+def summary_avg_grade(obj):
+    """
+    Average grade from the grade summary of obj, 0 when it has none yet
+    """
+    summary = getattr(obj, "grade_summary", None)
+    if summary is None:
+        return 0
+    return summary.avg_grade
+
+
+def statistics_html(obj, scope):
+    """
+    Grade distribution of the grades of obj, scope being the grade_array
+    keyword it filters on
+    """
+    if obj is None or obj.pk is None:
+        return "-"
+    stats = grade_statistics(grade_array(**{scope: obj}))
+    if not stats["count"]:
+        return "-"
+    return format_html(
+        "n={} mean={} std={} min={} max={}<br>{}<br>{}",
+        stats["count"],
+        f"{stats['mean']:.2f}",
+        f"{stats['std']:.2f}",
+        f"{stats['min']:.2f}",
+        f"{stats['max']:.2f}",
+        format_html_join(
+            " ",
+            "p{}={}",
+            ((p, f"{value:.2f}") for p, value in stats["percentiles"].items()),
+        ),
+        format_html_join(
+            " ", "{}+: {}", ((f"{edge:.0f}", n) for edge, n in stats["histogram"])
+        ),
+    )
 
 
 @admin.register(Faculty)
@@ -23,48 +180,53 @@ class FacultyAdmin(admin.ModelAdmin):
     """
 
     list_display = ("user", "num_courses", "num_assignments", "graded_assignments")
+    list_select_related = ("user", "grade_summary")
+
+    def get_queryset(self, request):
+        """
+        Annotates every column so the changelist is a fixed number of queries
+        """
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                course_count=subquery_count(
+                    Assignment.objects.all(),
+                    "content__faculty",
+                    count="course",
+                    distinct=True,
+                ),
+                assignment_count=subquery_count(
+                    Assignment.objects.all(), "content__faculty"
+                ),
+            )
+        )
 
     def num_courses(self, obj):
         """
         Returns number of courses.
         """
-        courses = obj.courses()
-        ids = [i.id for i in courses]
-        if courses:
-            html = '<a href="/admin/voyage/course/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(courses)}</a>')
-        return 0
+        return filter_link("/admin/voyage/course/", obj.course_count, faculty=obj.pk)
 
     def num_assignments(self, obj):
         """
         Returns number of assignments
         """
-        content = obj.content()
-        assignments = set(j for i in content for j in i.assignment_set.all())
-        ids = [i.id for i in assignments]
-        if assignments:
-            html = '<a href="/admin/voyage/assignment/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(assignments)}</a>')
-
-        return 0
+        return filter_link(
+            "/admin/voyage/assignment/", obj.assignment_count, faculty=obj.pk
+        )
 
+    @admin.display(ordering="grade_summary__num_graded")
     def graded_assignments(self, obj):
         """
         Returns number of assignments that have been graded
         """
-        assignments = obj.assignments_graded()
-        ids = [i.id for i in assignments]
-        if assignments:
-            html = '<a href="/admin/voyage/studentassignment/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(assignments)}</a>')
-
-        return 0
+        return filter_link(
+            "/admin/voyage/studentassignment/",
+            summary_count(obj, "num_graded"),
+            faculty=obj.pk,
+            grade__isnull="False",
+        )
 
 
 @admin.register(Student)
@@ -83,59 +245,112 @@ class StudentAdmin(admin.ModelAdmin):
     )
 
     list_display_links = ("user", "program")
+    list_filter = (parent_filter(Program, "program"),)
+    list_select_related = ("user", "program", "grade_summary")
+    change_list_template = "admin/voyage/student/change_list.html"
+
+    # Errors listed after an upload, the rest are counted
+    import_errors_shown = 20
+
+    def get_urls(self):
+        """
+        Adds the CSV upload
+        """
+        return [
+            path(
+                "import/",
+                self.admin_site.admin_view(self.import_view),
+                name="voyage_student_import",
+            ),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        """
+        Uploads a CSV of students, reporting the rows that failed
+        """
+        if not self.has_add_permission(request):
+            return redirect("admin:voyage_student_changelist")
+        form = StudentImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            # Hashed in this process, a pool forked from a web worker would
+            # copy its threads and connections. The management command keeps
+            # the pool for large files.
+            created, errors = import_students(
+                codecs.iterdecode(request.FILES["file"], "utf-8-sig"), processes=1
+            )
+            self.message_user(request, f"Imported {created} students")
+            for line, error in errors[: self.import_errors_shown]:
+                self.message_user(request, f"Line {line}: {error}", messages.ERROR)
+            if len(errors) > self.import_errors_shown:
+                self.message_user(
+                    request,
+                    f"{len(errors) - self.import_errors_shown} more rows failed",
+                    messages.ERROR,
+                )
+            return redirect("admin:voyage_student_changelist")
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Import students",
+            "opts": self.model._meta,
+            "form": form,
+        }
+        return TemplateResponse(request, "admin/voyage/student/import.html", context)
+
+    def get_queryset(self, request):
+        """
+        Annotates every column so the changelist is a fixed number of queries
+        """
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                course_count=subquery_count(
+                    Assignment.objects.all(),
+                    "program",
+                    outer="program",
+                    count="course",
+                    distinct=True,
+                ),
+                assignment_count=subquery_count(
+                    Assignment.objects.all(), "program", outer="program"
+                ),
+            )
+        )
 
     def num_courses(self, obj):
         """
         number of courses each student is enrolled in
         """
-        courses = obj.courses()
-        ids = [i.id for i in courses]
-        if courses:
-            html = '<a href="/admin/voyage/course/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(courses)}</a>')
-
-        return 0
+        return filter_link(
+            "/admin/voyage/course/", obj.course_count, program=obj.program_id
+        )
 
     def assignments_assigned(self, obj):
         """
         number of assignments assigned to the student
         """
-        assignments = obj.assignments()
-        ids = [i.id for i in assignments]
-        if assignments:
-            html = '<a href="/admin/voyage/assignment/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(assignments)}</a>')
-
-        return 0
+        return filter_link(
+            "/admin/voyage/assignment/", obj.assignment_count, program=obj.program_id
+        )
 
+    @admin.display(ordering="grade_summary__num_submitted")
     def assignments_submitted(self, obj):
         """
         number of assignments each student has submitted
         """
-        assignments = obj.assignments_submitted()
-        ids = [i.id for i in assignments]
-        if assignments:
-            html = '<a href="/admin/voyage/studentassignment/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(assignments)}</a>')
-
-        return 0
-
+        return filter_link(
+            "/admin/voyage/studentassignment/",
+            summary_count(obj, "num_submitted"),
+            student=obj.pk,
+            submitted__isnull="False",
+        )
+
+    @admin.display(ordering=SUMMARY_AVG_ORDERING)
     def avg_grade(self, obj):
         """
         average grade of each student
         """
-        graded_submissions = obj.assignments_graded()
-        if graded_submissions:
-            grades = [int(i.grade) for i in graded_submissions]
-
-            return sum(grades) / len(grades)
-        return 0
+        return summary_avg_grade(obj)
 
 
 @admin.register(Content)
@@ -146,34 +361,34 @@ class ContentAdmin(admin.ModelAdmin):
 
     list_display = ("name", "num_courses", "num_assignments")
 
+    def get_queryset(self, request):
+        """
+        Annotates every column so the changelist is a fixed number of queries
+        """
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                course_count=subquery_count(
+                    Assignment.objects.all(), "content", count="course", distinct=True
+                ),
+                assignment_count=subquery_count(Assignment.objects.all(), "content"),
+            )
+        )
+
     def num_courses(self, obj):
         """
         number of courses that use each content
         """
-        assignments = obj.assignment_set.all()
-        courses = set(i.course for i in assignments)
-        ids = [i.id for i in courses]
-        if courses:
-            html = '<a href="/admin/voyage/course/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(courses)}</a>')
-
-        return 0
+        return filter_link("/admin/voyage/course/", obj.course_count, content=obj.pk)
 
     def num_assignments(self, obj):
         """
         number of assignments that use each content
         """
-        assignments = obj.assignment_set.all()
-        ids = [i.id for i in assignments]
-        if assignments:
-            html = '<a href="/admin/voyage/assignment/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(assignments)}</a>')
-
-        return 0
+        return filter_link(
+            "/admin/voyage/assignment/", obj.assignment_count, content=obj.pk
+        )
 
 
 @admin.register(Program)
@@ -183,35 +398,51 @@ class ProgramAdmin(admin.ModelAdmin):
     """
 
     list_display = ("name", "num_courses", "num_students")
+    readonly_fields = ("grade_statistics",)
+    actions = ("add_course_repos",)
+
+    def get_queryset(self, request):
+        """
+        Annotates every column so the changelist is a fixed number of queries
+        """
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                course_count=subquery_count(
+                    Assignment.objects.all(), "program", count="course", distinct=True
+                ),
+                student_count=subquery_count(Student.objects.all(), "program"),
+            )
+        )
 
     def num_courses(self, obj):
         """
         number of courses in each program
         """
-        assignments = obj.assignment_set.all()
-        courses = set(i.course for i in assignments)
-        ids = [i.id for i in courses]
-        if courses:
-            html = '<a href="/admin/voyage/course/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(courses)}</a>')
-
-        return 0
+        return filter_link("/admin/voyage/course/", obj.course_count, program=obj.pk)
 
     def num_students(self, obj):
         """
         number of students in each program
         """
-        students = obj.students()
-        ids = [i.id for i in students]
-        if students:
-            html = '<a href="/admin/voyage/student/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(students)}</a>')
+        return filter_link("/admin/voyage/student/", obj.student_count, program=obj.pk)
 
-        return 0
+    def grade_statistics(self, obj):
+        """
+        distribution of the grades of the program
+        """
+        return statistics_html(obj, "program")
+
+    @admin.action(description="Create missing student course repos")
+    def add_course_repos(self, request, queryset):
+        """
+        Provisions the repos of every student of the selected programs
+        """
+        count = StudentCourseRepo.provision(
+            Student.objects.filter(program__in=queryset)
+        )
+        self.message_user(request, f"Created {count} course repos")
 
 
 @admin.register(Course)
@@ -221,40 +452,56 @@ class CourseAdmin(admin.ModelAdmin):
     """
 
     list_display = ("name", "num_assignments", "graded_100")
+    list_filter = (
+        parent_filter(Faculty, "assignment__content__faculty", distinct=True),
+        parent_filter(Program, "assignment__program", distinct=True),
+        parent_filter(Content, "assignment__content", distinct=True),
+    )
+    readonly_fields = ("grade_statistics",)
+
+    def get_queryset(self, request):
+        """
+        Annotates every column so the changelist is a fixed number of queries
+        """
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                assignment_count=subquery_count(Assignment.objects.all(), "course"),
+                graded_100_count=subquery_count(
+                    StudentAssignment.objects.filter(
+                        grade__gte=F("assignment__full_marks")
+                    ),
+                    "assignment__course",
+                ),
+            )
+        )
 
     def num_assignments(self, obj):
         """
         number of assignments in each course
         """
-        assignments = obj.assignments()
-        ids = [i.id for i in assignments]
-        if assignments:
-            html = '<a href="/admin/voyage/assignment/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(assignments)}</a>')
-
-        return 0
+        return filter_link(
+            "/admin/voyage/assignment/", obj.assignment_count, course=obj.pk
+        )
 
     def graded_100(self, obj):
         """
-        number of assignments that are completed and graded 100%
-        """
-        assignments = obj.assignments()
-        max_value = 999
-        graded = set()
-        for i in assignments:
-            for j in i.studentassignment_set.filter(grade__isnull=False):
-                if int(j.grade) == max_value:
-                    graded.add(j)
-        ids = [i.id for i in graded]
-        if graded:
-            html = '<a href="/admin/voyage/studentassignment/?id__in='
-            for i in ids:
-                html = "".join((html, f"{i},"))
-            return format_html(html[:-1] + f'">{len(graded)}</a>')
-
-        return 0
+        number of submissions graded at or above the full marks of
+        their assignment
+        """
+        return filter_link(
+            "/admin/voyage/studentassignment/",
+            obj.graded_100_count,
+            course=obj.pk,
+            full_marks="yes",
+        )
+
+    def grade_statistics(self, obj):
+        """
+        distribution of the grades of the course
+        """
+        return statistics_html(obj, "course")
 
 
 @admin.register(Assignment)
@@ -264,16 +511,28 @@ class AssignmentAdmin(admin.ModelAdmin):
     """
 
     list_display = ("rubric", "avg_grade")
+    list_filter = (
+        parent_filter(Faculty, "content__faculty"),
+        parent_filter(Program, "program"),
+        parent_filter(Course, "course"),
+        parent_filter(Content, "content"),
+    )
+    readonly_fields = ("grade_statistics",)
+
+    list_select_related = ("grade_summary",)
 
+    @admin.display(ordering=SUMMARY_AVG_ORDERING)
     def avg_grade(self, obj):
         """
         average grade of each assignment
         """
-        submissions = obj.submissions(graded=True)
-        if submissions:
-            grades = [int(i.grade) for i in submissions]
-            return sum(grades) / len(grades)
-        return 0
+        return summary_avg_grade(obj)
+
+    def grade_statistics(self, obj):
+        """
+        distribution of the grades of the assignment
+        """
+        return statistics_html(obj, "assignment")
 
 
 @admin.register(StudentAssignment)
@@ -281,3 +540,37 @@ class StudentAssignmentAdmin(admin.ModelAdmin):
     """
     StudentAssignmentAdmin
     """
+
+    list_filter = (
+        parent_filter(Faculty, "reviewer"),
+        parent_filter(Student, "student"),
+        parent_filter(Course, "assignment__course"),
+        FullMarksFilter,
+    )
+
+
+@admin.register(StudentCourseRepo)
+class StudentCourseRepoAdmin(admin.ModelAdmin):
+    """
+    StudentCourseRepoAdmin
+    """
+
+    list_display = ("repo", "student", "course")
+    list_select_related = ("student__user", "course")
+    list_filter = (
+        parent_filter(Student, "student"),
+        parent_filter(Course, "course"),
+    )
+
+
+@admin.register(GradingQueueItem)
+class GradingQueueItemAdmin(admin.ModelAdmin):
+    """
+    GradingQueueItemAdmin
+    """
+
+    list_display = ("student_assignment", "faculty", "due", "submitted", "claimed_by")
+    list_select_related = ("student_assignment", "faculty__user", "claimed_by__user")
+    list_filter = (parent_filter(Faculty, "faculty"),)
+    ordering = GradingQueueItem.PRIORITY
+    raw_id_fields = ("student_assignment",)
@@ -3,7 +3,7 @@ forms
 """
 
 from django import forms
-from .models import Course, Assignment
+from .models import Course, Assignment, Program
 
 
 class CreateCourseForm(forms.ModelForm):
@@ -24,7 +24,15 @@ class CreateAssignmentForm(forms.ModelForm):
 
     class Meta:
         model = Assignment
-        fields = ["program", "course", "content", "due", "instructions", "rubric"]
+        fields = [
+            "program",
+            "course",
+            "content",
+            "due",
+            "instructions",
+            "rubric",
+            "full_marks",
+        ]
         widgets = {
             "program": forms.Select(attrs={"class": "form-control"}),
             "course": forms.Select(attrs={"class": "form-control"}),
@@ -34,4 +42,47 @@ class CreateAssignmentForm(forms.ModelForm):
             ),
             "instructions": forms.Textarea(attrs={"rows": 3, "class": "form-control"}),
             "rubric": forms.Textarea(attrs={"rows": 1, "class": "form-control"}),
+            "full_marks": forms.NumberInput(attrs={"class": "form-control"}),
         }
+
+
+class GradebookExportForm(forms.Form):
+    """
+    Filters and format of a gradebook export
+    """
+
+    format = forms.ChoiceField(
+        choices=[("csv", "CSV"), ("parquet", "Parquet")], required=False
+    )
+    program = forms.ModelChoiceField(queryset=Program.objects.all(), required=False)
+    course = forms.ModelChoiceField(queryset=Course.objects.all(), required=False)
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+
+    def clean_format(self):
+        """
+        CSV unless asked otherwise
+        """
+        return self.cleaned_data["format"] or "csv"
+
+
+class GradeStatisticsForm(forms.Form):
+    """
+    Scope of the grade statistics, every grade when empty
+    """
+
+    program = forms.ModelChoiceField(queryset=Program.objects.all(), required=False)
+    course = forms.ModelChoiceField(queryset=Course.objects.all(), required=False)
+    assignment = forms.ModelChoiceField(
+        queryset=Assignment.objects.select_related("content"), required=False
+    )
+
+
+class StudentImportForm(forms.Form):
+    """
+    CSV of students to import
+    """
+
+    file = forms.FileField(
+        help_text="Columns: username, email, github, program (id), password"
+    )
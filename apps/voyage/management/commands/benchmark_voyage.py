@@ -0,0 +1,198 @@
+"""
+benchmark_voyage.py
+"""
+
+import json
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import URLPattern, reverse
+
+from ...models import Course, Student
+from ...urls.appurls import urlpatterns
+
+# Url kwargs that do not name the primary key of the view's model
+URL_KWARG_MODELS = {"student_id": Student, "course_id": Course}
+
+# Routes whose pk is not the primary key of the view's model
+ROUTE_PK_MODELS = {"num_students": Course, "num_assignments": Course}
+
+
+class Command(BaseCommand):
+    """
+    Seeds throwaway databases and measures every voyage route
+    """
+
+    help = "Benchmark wall time, queries and peak memory of every voyage route"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            default="1000,10000",
+            help="Comma separated StudentAssignment counts to seed",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--label", default="", help="Stored in the report")
+        parser.add_argument("--output", help="Write the JSON report here")
+        parser.add_argument(
+            "--compare", help="Previous JSON report to print regressions against"
+        )
+
+    def handle(self, *args, **options):
+        results = []
+        setup_test_environment()
+        try:
+            for scale in [int(i) for i in options["scales"].split(",")]:
+                results.extend(self.run_scale(scale, options))
+        finally:
+            teardown_test_environment()
+
+        report = {
+            "label": options["label"],
+            "vendor": connection.vendor,
+            "repeat": options["repeat"],
+            "results": results,
+        }
+        data = json.dumps(report, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fp:
+                fp.write(data + "\n")
+        else:
+            self.stdout.write(data)
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as fp:
+                self.compare(json.load(fp)["results"], results)
+
+    def run_scale(self, scale, options):
+        """
+        Seeds a fresh test database with scale submissions and measures it
+        """
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            call_command(
+                "generate_voyage_data",
+                students=max(10, scale // 20),
+                assignments=max(5, scale // 1000),
+                submissions=scale,
+                seed=options["seed"],
+                prefix=f"bench{scale}",
+                stdout=self.stderr,
+            )
+            # Staff reach every route, the gradebook and statistics included
+            staff = get_user_model().objects.create_user("benchmark", is_staff=True)
+            return [
+                dict(scale=scale, **self.measure(name, path, options["repeat"], staff))
+                for name, path in self.routes()
+            ]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    @staticmethod
+    def routes():
+        """
+        (name, path) of every named voyage route, kwargs filled from the data
+        """
+        for pattern in urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            model = getattr(pattern.callback, "view_class", None)
+            model = ROUTE_PK_MODELS.get(pattern.name, getattr(model, "model", None))
+            kwargs = {}
+            for kwarg in pattern.pattern.converters:
+                kwarg_model = URL_KWARG_MODELS.get(kwarg, model)
+                kwargs[kwarg] = (
+                    kwarg_model.objects.order_by("id")
+                    .values_list("id", flat=True)
+                    .first()
+                )
+            yield pattern.name, reverse(pattern.name, kwargs=kwargs)
+
+    @staticmethod
+    def fetch(client, path):
+        """
+        GET of path with its whole body read, a streamed body runs its
+        queries only while it is consumed. Returns (response, body size).
+        """
+        response = client.get(path)
+        if response.streaming:
+            return response, len(b"".join(response.streaming_content))
+        return response, len(response.content)
+
+    @classmethod
+    def measure(cls, name, path, repeat, user):
+        """
+        Times path repeat times on an empty cache, the work a cache miss
+        does, and repeat times on the cache that leaves. Counts queries and
+        peak memory of a miss. Requests are made logged in as user.
+        """
+        client = Client()
+        client.force_login(user)
+        cls.fetch(client, path)
+        cold = []
+        for _ in range(repeat):
+            cache.clear()
+            start = time.perf_counter()
+            cls.fetch(client, path)
+            cold.append((time.perf_counter() - start) * 1000)
+        warm = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cls.fetch(client, path)
+            warm.append((time.perf_counter() - start) * 1000)
+        cache.clear()
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response, size = cls.fetch(client, path)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            "route": name,
+            "path": path,
+            "status": response.status_code,
+            "queries": len(queries),
+            "bytes": size,
+            "wall_ms_min": round(min(cold), 3),
+            "wall_ms_median": round(statistics.median(cold), 3),
+            "warm_ms_min": round(min(warm), 3),
+            "warm_ms_median": round(statistics.median(warm), 3),
+            "peak_kib": round(peak / 1024, 1),
+        }
+
+    def compare(self, before, after):
+        """
+        Prints routes whose query count grew or cold or warm median rose
+        over 20%
+        """
+        previous = {(i["scale"], i["route"]): i for i in before}
+        for result in after:
+            old = previous.get((result["scale"], result["route"]))
+            if old is None:
+                continue
+            if result["queries"] > old["queries"]:
+                self.stderr.write(
+                    f"{result['route']} @ {result['scale']}: queries "
+                    f"{old['queries']} -> {result['queries']}"
+                )
+            for median in ("wall_ms_median", "warm_ms_median"):
+                # Reports from before warm timings have none to compare
+                if median in old and result[median] > old[median] * 1.2:
+                    self.stderr.write(
+                        f"{result['route']} @ {result['scale']}: {median} "
+                        f"{old[median]}ms -> {result[median]}ms"
+                    )
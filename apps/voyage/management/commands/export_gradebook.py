@@ -0,0 +1,61 @@
+"""
+export_gradebook.py
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...forms import GradebookExportForm
+from ...utils.gradebook import gradebook_rows, iter_csv, iter_parquet
+
+
+class Command(BaseCommand):
+    """
+    Streams the gradebook to a CSV or Parquet file
+    """
+
+    help = "Export StudentAssignment rows with student, course and program"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="File to write, - for stdout")
+        parser.add_argument("--format", default="csv", choices=["csv", "parquet"])
+        parser.add_argument("--program", help="Program id")
+        parser.add_argument("--course", help="Course id")
+        parser.add_argument("--start", help="Submitted on or after, YYYY-MM-DD")
+        parser.add_argument("--end", help="Submitted on or before, YYYY-MM-DD")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        form = GradebookExportForm(
+            {
+                name: options[name]
+                for name in ("format", "program", "course", "start", "end")
+                if options[name]
+            }
+        )
+        if not form.is_valid():
+            raise CommandError(form.errors.as_text())
+        data = form.cleaned_data
+        rows = gradebook_rows(
+            program=data["program"],
+            course=data["course"],
+            start=data["start"],
+            end=data["end"],
+            chunk_size=options["chunk_size"],
+        )
+        if data["format"] == "parquet":
+            chunks = iter_parquet(rows, options["chunk_size"])
+        else:
+            chunks = (line.encode() for line in iter_csv(rows))
+
+        if options["output"] == "-":
+            fp = sys.stdout.buffer
+        else:
+            fp = open(options["output"], "wb")  # pylint: disable=consider-using-with
+        try:
+            for chunk in chunks:
+                fp.write(chunk)
+        finally:
+            if fp is not sys.stdout.buffer:
+                fp.close()
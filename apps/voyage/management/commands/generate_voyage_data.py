@@ -0,0 +1,278 @@
+"""
+generate_voyage_data.py
+"""
+
+import datetime
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import (
+    Faculty,
+    Program,
+    Course,
+    Content,
+    Student,
+    Assignment,
+    StudentAssignment,
+    GradingQueueItem,
+    StudentProgress,
+)
+from ...signals import GRADE_SUMMARIES
+from ...utils.batch import bulk_insert
+from ...utils.cache import invalidate_pages, invalidate_rosters
+
+
+class Command(BaseCommand):
+    """
+    Generates synthetic voyage data at load testing scale
+    """
+
+    help = "Generate seeded synthetic voyage data with chunked bulk inserts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--programs", type=int, default=3)
+        parser.add_argument("--courses", type=int, default=3)
+        parser.add_argument("--faculty", type=int, default=5)
+        parser.add_argument("--students", type=int, default=100)
+        parser.add_argument("--assignments", type=int, default=30)
+        parser.add_argument("--submissions", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--prefix",
+            default="voyage",
+            help="Prefix of generated names, must be unused",
+        )
+        parser.add_argument(
+            "--skip-summaries",
+            action="store_true",
+            help="Do not rebuild the summaries, grading queue and timelines afterwards",
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.size = options["chunk_size"]
+        self.prefix = options["prefix"]
+        if Course.objects.filter(name__startswith=f"{self.prefix}-").exists():
+            raise CommandError(f"Data with prefix {self.prefix} already exists")
+        for name in ("programs", "courses", "faculty", "assignments"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} must be at least 1")
+
+        self.password = make_password("password")
+        programs = self.step("programs", self.programs, options["programs"])
+        courses = self.step("courses", self.courses, options["courses"])
+        faculty = self.step("faculty", self.faculty, options["faculty"])
+        assignments = self.step(
+            "assignments",
+            self.assignments,
+            options["assignments"],
+            programs,
+            courses,
+            faculty,
+        )
+        students = self.step("students", self.students, options["students"], programs)
+        self.step(
+            "submissions",
+            self.submissions,
+            options["submissions"],
+            students,
+            assignments,
+        )
+        invalidate_rosters()
+        invalidate_pages()
+        if not options["skip_summaries"]:
+            for summary in GRADE_SUMMARIES:
+                self.step(summary.__name__, summary.rebuild)
+            self.step("GradingQueueItem", GradingQueueItem.rebuild)
+            self.step("StudentProgress", StudentProgress.rebuild)
+
+    def step(self, name, func, *args):
+        """
+        Runs one generation step and reports its timing
+        """
+        start = time.perf_counter()
+        result = func(*args)
+        self.stdout.write(f"{name}: {time.perf_counter() - start:.2f}s")
+        return result
+
+    def programs(self, count):
+        """
+        Programs with random start dates, returns {id: start}
+        """
+
+        def rows():
+            for i in range(count):
+                start = datetime.datetime(
+                    year=self.rng.randint(2020, 2024),
+                    month=self.rng.randint(1, 12),
+                    day=self.rng.randint(1, 28),
+                    tzinfo=datetime.timezone.utc,
+                )
+                yield Program(
+                    name=f"{self.prefix}-cohort-{i}",
+                    start=start,
+                    end=start.replace(year=start.year + 5),
+                )
+
+        bulk_insert(Program, rows(), self.size)
+        return dict(
+            Program.objects.filter(name__startswith=f"{self.prefix}-cohort-")
+            .order_by("id")
+            .values_list("id", "start")
+        )
+
+    def courses(self, count):
+        """
+        Courses, returns their ids
+        """
+        rows = (Course(name=f"{self.prefix}-course-{i}") for i in range(count))
+        bulk_insert(Course, rows, self.size)
+        return list(
+            Course.objects.filter(name__startswith=f"{self.prefix}-course-")
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def users(self, role, count):
+        """
+        Users sharing one password hash, streams back (index, user id)
+        """
+        user_model = get_user_model()
+        rows = (
+            user_model(
+                username=f"{self.prefix}-{role}-{i}",
+                email=f"{self.prefix}-{role}-{i}@example.com",
+                password=self.password,
+            )
+            for i in range(count)
+        )
+        bulk_insert(user_model, rows, self.size)
+        ids = (
+            user_model.objects.filter(username__startswith=f"{self.prefix}-{role}-")
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        return enumerate(ids.iterator(chunk_size=self.size))
+
+    def faculty(self, count):
+        """
+        Faculty, returns their ids
+        """
+        rows = (
+            Faculty(user_id=user_id, github=f"{self.prefix}-faculty-{i}")
+            for i, user_id in self.users("faculty", count)
+        )
+        bulk_insert(Faculty, rows, self.size)
+        return list(
+            Faculty.objects.filter(github__startswith=f"{self.prefix}-faculty-")
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def assignments(self, count, programs, courses, faculty):
+        """
+        One content per assignment, spread over programs round robin.
+        Returns {program id: [(assignment id, due, reviewer id), ...]}
+        """
+        rows = (
+            Content(
+                name=f"{self.prefix}-content-{i}",
+                faculty_id=faculty[i % len(faculty)],
+                repo=f"https://github.com/{self.prefix}/content-{i}",
+            )
+            for i in range(count)
+        )
+        bulk_insert(Content, rows, self.size)
+        contents = (
+            Content.objects.filter(name__startswith=f"{self.prefix}-content-")
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        program_ids = list(programs)
+
+        def rows():
+            for i, content_id in enumerate(contents.iterator(chunk_size=self.size)):
+                program_id = program_ids[i % len(program_ids)]
+                yield Assignment(
+                    program_id=program_id,
+                    course_id=self.rng.choice(courses),
+                    content_id=content_id,
+                    due=programs[program_id]
+                    + datetime.timedelta(days=self.rng.randint(1, 365)),
+                    instructions=f"Instructions for Assignment {i}",
+                    rubric=f"Assignment {i}",
+                )
+
+        bulk_insert(Assignment, rows(), self.size)
+        assignments = {}
+        for row in (
+            Assignment.objects.filter(content__name__startswith=f"{self.prefix}-")
+            .order_by("id")
+            .values_list("program_id", "id", "due", "content__faculty_id")
+            .iterator(chunk_size=self.size)
+        ):
+            assignments.setdefault(row[0], []).append(row[1:])
+        return assignments
+
+    def students(self, count, programs):
+        """
+        Students in random programs, returns [(id, program id), ...]
+        """
+        program_ids = list(programs)
+        rows = (
+            Student(
+                user_id=user_id,
+                github=f"{self.prefix}-student-{i}",
+                program_id=self.rng.choice(program_ids),
+            )
+            for i, user_id in self.users("student", count)
+        )
+        bulk_insert(Student, rows, self.size)
+        return list(
+            Student.objects.filter(github__startswith=f"{self.prefix}-student-")
+            .order_by("id")
+            .values_list("id", "program_id")
+        )
+
+    def submissions(self, count, students, assignments):
+        """
+        StudentAssignments, cycling students so pairs repeat only once a
+        student has every assignment of their program
+        """
+        students = [i for i in students if i[1] in assignments]
+        if not students:
+            return 0
+
+        def rows():
+            for n in range(count):
+                student_id, program_id = students[n % len(students)]
+                program = assignments[program_id]
+                assignment_id, due, reviewer_id = program[
+                    (n // len(students)) % len(program)
+                ]
+                submitted = reviewed = grade = reviewer = None
+                if self.rng.random() < 0.8:
+                    submitted = due + datetime.timedelta(
+                        hours=self.rng.randint(-72, 72)
+                    )
+                    if self.rng.random() < 0.7:
+                        reviewed = submitted + datetime.timedelta(
+                            days=self.rng.randint(1, 7)
+                        )
+                        grade = self.rng.randint(0, 999)
+                        reviewer = reviewer_id
+                yield StudentAssignment(
+                    student_id=student_id,
+                    assignment_id=assignment_id,
+                    grade=grade,
+                    submitted=submitted,
+                    reviewed=reviewed,
+                    reviewer_id=reviewer,
+                )
+
+        return bulk_insert(StudentAssignment, rows(), self.size)
@@ -0,0 +1,43 @@
+"""
+import_students.py
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...utils.onboarding import STUDENT_COLUMNS, import_students
+
+
+class Command(BaseCommand):
+    """
+    Imports students from a CSV file
+    """
+
+    help = (
+        f"Create users and students from a CSV with the columns "
+        f"{', '.join(STUDENT_COLUMNS)}, program being an id and password optional"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import")
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Password hashing processes, defaults to the number of CPUs",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        with open(options["path"], newline="", encoding="utf-8-sig") as fp:
+            created, errors = import_students(
+                fp, chunk_size=options["chunk_size"], processes=options["processes"]
+            )
+        for line, error in errors:
+            self.stderr.write(f"line {line}: {error}")
+        self.stdout.write(
+            f"Created {created} students, {len(errors)} rows failed in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
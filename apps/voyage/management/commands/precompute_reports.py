@@ -0,0 +1,33 @@
+"""
+precompute_reports.py
+"""
+
+from django.core.management.base import BaseCommand
+
+from ...tasks import REPORT_TASKS, chunk_size, precompute_reports
+from ...utils.batch import chunked
+
+
+class Command(BaseCommand):
+    """
+    Precomputes the cached voyage reports on demand
+    """
+
+    help = "Queue the report tasks, or run them in this process with --sync"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Compute here instead of queueing to the celery workers",
+        )
+
+    def handle(self, *args, **options):
+        if not options["sync"]:
+            precompute_reports.delay()
+            self.stdout.write("Queued precompute_reports")
+            return
+        for task, model in REPORT_TASKS:
+            ids = model.objects.order_by("id").values_list("id", flat=True)
+            count = sum(task(chunk) for chunk in chunked(ids.iterator(), chunk_size()))
+            self.stdout.write(f"{task.name}: {count} reports")
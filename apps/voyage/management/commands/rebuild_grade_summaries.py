@@ -0,0 +1,38 @@
+"""
+rebuild_grade_summaries.py
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...signals import GRADE_SUMMARIES
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the grade summary tables from StudentAssignment rows
+    """
+
+    help = "Rebuild the grade summary tables and verify they match the raw rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drift, do not rebuild",
+        )
+
+    def handle(self, *args, **options):
+        drifted = False
+        for summary in GRADE_SUMMARIES:
+            name = summary.__name__
+            if not options["check"]:
+                count = summary.rebuild()
+                self.stdout.write(f"Rebuilt {count} {name}")
+            drift = summary.drift()
+            if drift:
+                drifted = True
+                self.stderr.write(f"{len(drift)} {name} drifted: {drift[:20]}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"No drift in {name}"))
+        if drifted:
+            raise CommandError("Grade summaries have drifted")
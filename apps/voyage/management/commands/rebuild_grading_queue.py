@@ -0,0 +1,19 @@
+"""
+rebuild_grading_queue.py
+"""
+
+from django.core.management.base import BaseCommand
+
+from ...models import GradingQueueItem
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the grading queue from StudentAssignment rows
+    """
+
+    help = "Rebuild the grading queue, releasing every claim"
+
+    def handle(self, *args, **options):
+        count = GradingQueueItem.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Queued {count} submissions"))
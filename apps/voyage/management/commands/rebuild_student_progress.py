@@ -0,0 +1,19 @@
+"""
+rebuild_student_progress.py
+"""
+
+from django.core.management.base import BaseCommand
+
+from ...models import StudentProgress
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the student progress timelines from StudentAssignment rows
+    """
+
+    help = "Rebuild the student progress timelines"
+
+    def handle(self, *args, **options):
+        count = StudentProgress.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} timeline entries"))
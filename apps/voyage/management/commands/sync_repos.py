@@ -0,0 +1,38 @@
+"""
+sync_repos.py
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...models import StudentCourseRepo
+from ...utils.reposync import sync_repos
+
+
+class Command(BaseCommand):
+    """
+    Syncs submissions from the student course repos
+    """
+
+    help = "Mark assignments submitted from new commits in student course repos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--program", type=int, help="Only this program's repos")
+        parser.add_argument("--concurrency", type=int)
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        repos = StudentCourseRepo.objects.all()
+        if options["program"]:
+            repos = repos.filter(student__program=options["program"])
+        start = time.perf_counter()
+        checked, submitted = sync_repos(
+            repos,
+            concurrency=options["concurrency"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(
+            f"Checked {checked} repos, {submitted} assignments submitted in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
@@ -0,0 +1,171 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:48
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+# (summary model, summary field, StudentAssignment key)
+SUMMARIES = (
+    ("StudentGradeSummary", "student", "student"),
+    ("AssignmentGradeSummary", "assignment", "assignment"),
+    ("FacultyGradeSummary", "faculty", "reviewer"),
+)
+
+
+def fill_summaries(apps, schema_editor):
+    """
+    Summaries of the existing rows, as GradeSummary.rebuild computes them.
+    Signals only apply deltas, they would start every summary from zero.
+    """
+    student_assignment = apps.get_model("voyage", "StudentAssignment")
+    for name, field, key in SUMMARIES:
+        summary = apps.get_model("voyage", name)
+        rows = (
+            student_assignment.objects.filter(**{f"{key}__isnull": False})
+            .order_by()
+            .values(key)
+            .annotate(
+                num_submitted=Count("submitted"),
+                num_graded=Count("grade"),
+                grade_total=Coalesce(
+                    Sum("grade"),
+                    Value(Decimal(0)),
+                    output_field=models.DecimalField(max_digits=14, decimal_places=2),
+                ),
+            )
+        )
+        summary.objects.bulk_create(
+            [summary(**{f"{field}_id": row.pop(key)}, **row) for row in rows],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voyage", "0002_alter_content_options_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StudentGradeSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dtm_created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="DTM Created"),
+                ),
+                (
+                    "dtm_updated",
+                    models.DateTimeField(auto_now=True, verbose_name="DTM Updated"),
+                ),
+                ("num_submitted", models.PositiveIntegerField(default=0)),
+                ("num_graded", models.PositiveIntegerField(default=0)),
+                (
+                    "grade_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "student",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grade_summary",
+                        to="voyage.student",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="FacultyGradeSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dtm_created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="DTM Created"),
+                ),
+                (
+                    "dtm_updated",
+                    models.DateTimeField(auto_now=True, verbose_name="DTM Updated"),
+                ),
+                ("num_submitted", models.PositiveIntegerField(default=0)),
+                ("num_graded", models.PositiveIntegerField(default=0)),
+                (
+                    "grade_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "faculty",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grade_summary",
+                        to="voyage.faculty",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="AssignmentGradeSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dtm_created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="DTM Created"),
+                ),
+                (
+                    "dtm_updated",
+                    models.DateTimeField(auto_now=True, verbose_name="DTM Updated"),
+                ),
+                ("num_submitted", models.PositiveIntegerField(default=0)),
+                ("num_graded", models.PositiveIntegerField(default=0)),
+                (
+                    "grade_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "assignment",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grade_summary",
+                        to="voyage.assignment",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voyage", "0003_grade_summaries"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="studentassignment",
+            index=models.Index(
+                fields=["student", "submitted"], name="voyage_sa_student_submitted"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentassignment",
+            index=models.Index(
+                fields=["student", "grade"], name="voyage_sa_student_grade"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentassignment",
+            index=models.Index(
+                fields=["assignment", "grade"], name="voyage_sa_assignment_grade"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentassignment",
+            index=models.Index(
+                fields=["reviewer", "grade"], name="voyage_sa_reviewer_grade"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentassignment",
+            index=models.Index(
+                condition=models.Q(("submitted__isnull", False)),
+                fields=["submitted", "id"],
+                name="voyage_sa_submitted_id",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:10
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voyage", "0004_studentassignment_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assignment",
+            name="full_marks",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=Decimal("999"),
+                help_text="Grades at or above this count as full marks",
+                max_digits=5,
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voyage", "0005_assignment_full_marks"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StudentCourseRepo",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dtm_created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="DTM Created"),
+                ),
+                (
+                    "dtm_updated",
+                    models.DateTimeField(auto_now=True, verbose_name="DTM Updated"),
+                ),
+                ("repo", models.URLField(max_length=240)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="voyage.course"
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="voyage.student"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="studentcourserepo",
+            constraint=models.UniqueConstraint(
+                fields=("student", "course"), name="voyage_student_course_repo"
+            ),
+        ),
+    ]
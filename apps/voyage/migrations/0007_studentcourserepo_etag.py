@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voyage", "0006_studentcourserepo"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="studentcourserepo",
+            name="etag",
+            field=models.CharField(
+                blank=True, help_text="Head seen by the last sync", max_length=128
+            ),
+        ),
+    ]
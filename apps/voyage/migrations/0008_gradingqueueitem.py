@@ -0,0 +1,113 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:21
+
+from itertools import islice
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_queue(apps, schema_editor):
+    """
+    Queues the submitted, ungraded rows that already exist, as
+    GradingQueueItem.rebuild does
+    """
+    student_assignment = apps.get_model("voyage", "StudentAssignment")
+    item = apps.get_model("voyage", "GradingQueueItem")
+    rows = (
+        student_assignment.objects.filter(
+            submitted__isnull=False,
+            grade__isnull=True,
+            assignment__content__faculty__isnull=False,
+        )
+        .order_by()
+        .values_list(
+            "id", "assignment__content__faculty_id", "assignment__due", "submitted"
+        )
+        .iterator(chunk_size=1000)
+    )
+    while chunk := list(islice(rows, 1000)):
+        item.objects.bulk_create(
+            [
+                item(
+                    student_assignment_id=pk,
+                    faculty_id=faculty_id,
+                    due=due,
+                    submitted=submitted,
+                )
+                for pk, faculty_id, due, submitted in chunk
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voyage", "0007_studentcourserepo_etag"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GradingQueueItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dtm_created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="DTM Created"),
+                ),
+                (
+                    "dtm_updated",
+                    models.DateTimeField(auto_now=True, verbose_name="DTM Updated"),
+                ),
+                ("due", models.DateTimeField()),
+                ("submitted", models.DateTimeField()),
+                (
+                    "claimed_at",
+                    models.DateTimeField(blank=True, default=None, null=True),
+                ),
+                (
+                    "claimed_by",
+                    models.ForeignKey(
+                        blank=True,
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="voyage.faculty",
+                    ),
+                ),
+                (
+                    "faculty",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grading_queue",
+                        to="voyage.faculty",
+                    ),
+                ),
+                (
+                    "student_assignment",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="queue_item",
+                        to="voyage.studentassignment",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["faculty", "due", "submitted", "id"],
+                        name="voyage_queue_priority",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_queue, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:24
+
+from itertools import islice
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_progress(apps, schema_editor):
+    """
+    Timeline entries of the rows that already exist, as
+    StudentProgress.rebuild builds them
+    """
+    student_assignment = apps.get_model("voyage", "StudentAssignment")
+    progress = apps.get_model("voyage", "StudentProgress")
+    rows = (
+        student_assignment.objects.order_by()
+        .values_list(
+            "id",
+            "student_id",
+            "assignment_id",
+            "assignment__course_id",
+            "assignment__due",
+            "submitted",
+            "reviewed",
+            "grade",
+        )
+        .iterator(chunk_size=1000)
+    )
+    while chunk := list(islice(rows, 1000)):
+        progress.objects.bulk_create(
+            [
+                progress(
+                    student_assignment_id=pk,
+                    student_id=student_id,
+                    assignment_id=assignment_id,
+                    course_id=course_id,
+                    due=due,
+                    submitted=submitted,
+                    reviewed=reviewed,
+                    grade=grade,
+                )
+                for pk, student_id, assignment_id, course_id, due, submitted, reviewed, grade in chunk
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voyage", "0008_gradingqueueitem"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StudentProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dtm_created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="DTM Created"),
+                ),
+                (
+                    "dtm_updated",
+                    models.DateTimeField(auto_now=True, verbose_name="DTM Updated"),
+                ),
+                ("due", models.DateTimeField()),
+                (
+                    "submitted",
+                    models.DateTimeField(blank=True, default=None, null=True),
+                ),
+                ("reviewed", models.DateTimeField(blank=True, default=None, null=True)),
+                (
+                    "grade",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        default=None,
+                        max_digits=5,
+                        null=True,
+                    ),
+                ),
+                (
+                    "assignment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="voyage.assignment",
+                    ),
+                ),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="voyage.course",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="progress",
+                        to="voyage.student",
+                    ),
+                ),
+                (
+                    "student_assignment",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="progress",
+                        to="voyage.studentassignment",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["student", "due", "id"], name="voyage_progress_timeline"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_progress, migrations.RunPython.noop),
+    ]
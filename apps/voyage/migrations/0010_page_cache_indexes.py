@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voyage", "0009_studentprogress"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="assignment",
+            index=models.Index(
+                fields=["dtm_updated"], name="voyage_assignment_updated"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assignmentgradesummary",
+            index=models.Index(
+                fields=["dtm_updated"], name="voyage_asg_summary_updated"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="faculty",
+            index=models.Index(fields=["dtm_updated"], name="voyage_faculty_updated"),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(fields=["dtm_updated"], name="voyage_student_updated"),
+        ),
+    ]
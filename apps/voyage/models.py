@@ -4,9 +4,18 @@ models.py
 
 import random
 import datetime
+from contextlib import nullcontext
+from decimal import Decimal
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.text import slugify
 from qux.models import QuxModel
+from .utils.batch import chunked, update_from_values
+from .utils.cache import cached_ids, invalidate_pages
 
 
 class Faculty(QuxModel):
@@ -18,6 +27,9 @@ class Faculty(QuxModel):
     github = models.CharField(max_length=39, unique=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["dtm_updated"], name="voyage_faculty_updated")]
+
     def programs(self):
         """
         returns list of programs which has the current faculty
@@ -32,28 +44,18 @@ class Faculty(QuxModel):
 
     def content(self, program=None, course=None):
         """
-        returns list of content associated with the current faculty
+        returns queryset of content associated with the current faculty,
+        optionally only content used by assignments of program and/or course
         """
-        content_list = Content.objects.filter(faculty=self)
-        if program and course:
-            return [
-                i
-                for i in content_list
-                if Assignment.objects.filter(program=program, course=course, content=i)
-            ]
+        content = Content.objects.filter(faculty=self)
+        if not (program or course):
+            return content
+        assignments = Assignment.objects.filter(content=OuterRef("pk"))
         if program:
-            return [
-                i
-                for i in content_list
-                if Assignment.objects.filter(program=program, content=i)
-            ]
+            assignments = assignments.filter(program=program)
         if course:
-            return [
-                i
-                for i in content_list
-                if Assignment.objects.filter(course=course, content=i)
-            ]
-        return content_list
+            assignments = assignments.filter(course=course)
+        return content.filter(Exists(assignments))
 
     def assignments_graded(self, assignment=None):
         """
@@ -61,11 +63,9 @@ class Faculty(QuxModel):
         """
         if assignment:
             return StudentAssignment.objects.filter(
-                assignment=assignment, reviewer=self
-            ).exclude(grade__isnull=True)
-        return StudentAssignment.objects.filter(reviewer=self).exclude(
-            grade__isnull=True
-        )
+                assignment=assignment, reviewer=self, grade__isnull=False
+            )
+        return StudentAssignment.objects.filter(reviewer=self, grade__isnull=False)
 
     def random_data(self):
         """
@@ -105,6 +105,12 @@ class Program(QuxModel):
         """
         return Student.objects.filter(program=self)
 
+    def add_course_repos(self):
+        """
+        Creates the missing course repos of every student in the program
+        """
+        return StudentCourseRepo.provision(self.students())
+
     def random_data(self):
         """
         Generates Random Data
@@ -136,15 +142,24 @@ class Course(QuxModel):
 
     def programs(self):
         """
-        list of all programs with current course
+        list of all programs with current course, a handful of ids cached
+        per roster version
         """
-        return Program.objects.filter(assignment__course=self).distinct()
+        ids = cached_ids(
+            f"course:{self.pk}:programs",
+            Program.objects.filter(assignment__course=self).distinct(),
+        )
+        return Program.objects.filter(id__in=ids)
 
     def students(self):
         """
-        list of all sudents doing the current course
+        list of all sudents doing the current course. Not cached, a course
+        can have thousands of students. The programs subquery needs no
+        distinct, so the queryset combines with others.
         """
-        return Student.objects.filter(program__assignment__course=self).distinct()
+        return Student.objects.filter(
+            program__in=Program.objects.filter(assignment__course=self)
+        )
 
     def content(self):
         """
@@ -211,14 +226,22 @@ class Student(QuxModel):
     is_active = models.BooleanField(default=True)
     program = models.ForeignKey(Program, on_delete=models.DO_NOTHING)
 
+    class Meta:
+        indexes = [models.Index(fields=["dtm_updated"], name="voyage_student_updated")]
+
     def __str__(self):
         return self.user.username
     
     def courses(self):
         """
-        List of courses the student is doing
+        List of courses the student is doing, a handful of ids cached per
+        roster version
         """
-        return Course.objects.filter(assignment__program__student=self).distinct()
+        ids = cached_ids(
+            f"student:{self.pk}:courses",
+            Course.objects.filter(assignment__program__student=self).distinct(),
+        )
+        return Course.objects.filter(id__in=ids)
 
     def assignments(self):
         """
@@ -257,16 +280,10 @@ class Student(QuxModel):
         return StudentAssignment.objects.filter(student=self, grade__isnull=False)
     
     def add_course_repo(self):
-        courses = self.courses()
-        github = self.github.split(",")[0]
-        print(github)
-        for i in courses:
-            if i.name in self.github:
-                continue
-            repo = f" ,{github}/{i.name}"
-            github = self.github+repo
-        self.github=github
-        self.save()
+        """
+        Creates the missing repos of the student's courses
+        """
+        return StudentCourseRepo.provision(Student.objects.filter(pk=self.pk))
 
     def random_data(self):
         """
@@ -312,9 +329,18 @@ class Assignment(QuxModel):
     due = models.DateTimeField()
     instructions = models.TextField()
     rubric = models.TextField()
+    full_marks = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=Decimal("999"),
+        help_text="Grades at or above this count as full marks",
+    )
 
     class Meta:
         unique_together = ["program", "course", "content"]
+        indexes = [
+            models.Index(fields=["dtm_updated"], name="voyage_assignment_updated")
+        ]
 
     def __str__(self):
         return self.content.name
@@ -395,6 +421,24 @@ class StudentAssignment(QuxModel):
     )
     feedback = models.TextField(default=None, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["student", "submitted"], name="voyage_sa_student_submitted"
+            ),
+            models.Index(fields=["student", "grade"], name="voyage_sa_student_grade"),
+            models.Index(
+                fields=["assignment", "grade"], name="voyage_sa_assignment_grade"
+            ),
+            models.Index(fields=["reviewer", "grade"], name="voyage_sa_reviewer_grade"),
+            # Partial where supported, MySQL skips conditional indexes
+            models.Index(
+                fields=["submitted", "id"],
+                condition=models.Q(submitted__isnull=False),
+                name="voyage_sa_submitted_id",
+            ),
+        ]
+
     def random_data(self):
         """
         Generates Random Data
@@ -432,6 +476,606 @@ class StudentAssignment(QuxModel):
         StudentAssignment.objects.bulk_create(lst)
 
 
+class StudentCourseRepo(QuxModel):
+    """
+    GitHub repo of a student for one course
+    """
+
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    repo = models.URLField(max_length=240)
+    etag = models.CharField(
+        max_length=128, blank=True, help_text="Head seen by the last sync"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "course"], name="voyage_student_course_repo"
+            ),
+        ]
+
+    def __str__(self):
+        return self.repo
+
+    @staticmethod
+    def repo_url(github, course_name):
+        """
+        Repo of a course under a GitHub handle or profile url
+        """
+        if "://" not in github:
+            github = f"https://github.com/{github}"
+        return f"{github.rstrip('/')}/{slugify(course_name)}"
+
+    @classmethod
+    def provision(cls, students, batch_size=1000):
+        """
+        Creates the repos students are missing for the courses of their
+        programs. The missing pairs come from one joined query, existing
+        and concurrently created repos are skipped by the unique constraint.
+        """
+        missing = (
+            students.filter(program__assignment__isnull=False)
+            .exclude(
+                Exists(
+                    cls.objects.filter(
+                        student=OuterRef("pk"),
+                        course=OuterRef("program__assignment__course"),
+                    )
+                )
+            )
+            .order_by()
+            .values_list(
+                "id",
+                "github",
+                "program__assignment__course",
+                "program__assignment__course__name",
+            )
+            .distinct()
+        )
+        repos = [
+            cls(
+                student_id=student_id,
+                course_id=course_id,
+                repo=cls.repo_url(github, course_name),
+            )
+            for student_id, github, course_id, course_name in missing
+        ]
+        cls.objects.bulk_create(repos, batch_size=batch_size, ignore_conflicts=True)
+        return len(repos)
+
+
+class GradingQueueItem(QuxModel):
+    """
+    Submitted, ungraded StudentAssignment waiting on the faculty of its
+    content. due and submitted are copied from the assignment and the row
+    so the next item of a faculty is one seek of the priority index rather
+    than a sort of the joined backlog.
+    """
+
+    # Earliest due date first, then the longest waiting submission
+    PRIORITY = ("due", "submitted", "id")
+
+    student_assignment = models.OneToOneField(
+        StudentAssignment, on_delete=models.CASCADE, related_name="queue_item"
+    )
+    faculty = models.ForeignKey(
+        Faculty, on_delete=models.CASCADE, related_name="grading_queue"
+    )
+    due = models.DateTimeField()
+    submitted = models.DateTimeField()
+    claimed_by = models.ForeignKey(
+        Faculty,
+        on_delete=models.SET_NULL,
+        default=None,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    claimed_at = models.DateTimeField(default=None, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["faculty", "due", "submitted", "id"],
+                name="voyage_queue_priority",
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.student_assignment_id)
+
+    @staticmethod
+    def waiting(ids=None):
+        """
+        (id, faculty id, due, submitted) of the submitted, ungraded
+        StudentAssignments, all of them or only ids
+        """
+        rows = StudentAssignment.objects.filter(
+            submitted__isnull=False,
+            grade__isnull=True,
+            assignment__content__faculty__isnull=False,
+        )
+        if ids is not None:
+            rows = rows.filter(id__in=ids)
+        return rows.order_by().values_list(
+            "id", "assignment__content__faculty_id", "assignment__due", "submitted"
+        )
+
+    @classmethod
+    def sync(cls, ids):
+        """
+        Brings the queue in line with the StudentAssignments ids. Rows
+        still waiting keep their claim, graded or unsubmitted rows leave.
+        """
+        ids = list(ids)
+        waiting = {pk: values for pk, *values in cls.waiting(ids)}
+        with transaction.atomic():
+            cls.objects.filter(student_assignment__in=ids).exclude(
+                student_assignment__in=list(waiting)
+            ).delete()
+            now = timezone.now()
+            stale = []
+            for item in cls.objects.filter(student_assignment__in=list(waiting)):
+                values = waiting.pop(item.student_assignment_id)
+                if [item.faculty_id, item.due, item.submitted] != values:
+                    item.faculty_id, item.due, item.submitted = values
+                    item.dtm_updated = now
+                    stale.append(item)
+            cls.objects.bulk_update(
+                stale, ["faculty", "due", "submitted", "dtm_updated"]
+            )
+            cls.objects.bulk_create(
+                [
+                    cls(
+                        student_assignment_id=pk,
+                        faculty_id=faculty_id,
+                        due=due,
+                        submitted=submitted,
+                    )
+                    for pk, (faculty_id, due, submitted) in waiting.items()
+                ],
+                ignore_conflicts=True,
+            )
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        """
+        Recomputes the whole queue from StudentAssignment rows, dropping
+        every claim
+        """
+        count = 0
+        with transaction.atomic():
+            cls.objects.all().delete()
+            for chunk in chunked(
+                cls.waiting().iterator(chunk_size=batch_size), batch_size
+            ):
+                count += len(
+                    cls.objects.bulk_create(
+                        cls(
+                            student_assignment_id=pk,
+                            faculty_id=faculty_id,
+                            due=due,
+                            submitted=submitted,
+                        )
+                        for pk, faculty_id, due, submitted in chunk
+                    )
+                )
+        return count
+
+    @staticmethod
+    def claim_cutoff():
+        """
+        Claims made before this time have lapsed, after
+        GRADING_CLAIM_TIMEOUT seconds
+        """
+        timeout = getattr(settings, "GRADING_CLAIM_TIMEOUT", 1800)
+        return timezone.now() - datetime.timedelta(seconds=timeout)
+
+    @classmethod
+    def claim(cls, faculty, count=1):
+        """
+        Claims the next count unclaimed items of faculty, returns their
+        StudentAssignments in priority order. A claim lapses after
+        GRADING_CLAIM_TIMEOUT seconds so abandoned work returns to the queue.
+
+        Rows locked by a concurrent claim are skipped, not waited on. Where
+        the database has no row locks the claiming UPDATE is conditional,
+        the loser of a race moves on to the next item.
+        """
+        now = timezone.now()
+        free = Q(claimed_at__isnull=True) | Q(claimed_at__lt=cls.claim_cutoff())
+        queue = cls.objects.filter(free, faculty=faculty)
+        locking = connection.features.has_select_for_update_skip_locked
+        if locking:
+            queue = queue.select_for_update(skip_locked=True)
+        claimed = []
+        while len(claimed) < count:
+            # Without row locks a read transaction would only hold the
+            # database lock longer, each conditional UPDATE commits alone
+            with transaction.atomic() if locking else nullcontext():
+                ids = list(
+                    queue.order_by(*cls.PRIORITY).values_list("id", flat=True)[
+                        : count - len(claimed)
+                    ]
+                )
+                if not ids:
+                    break
+                for pk in ids:
+                    if cls.objects.filter(free, pk=pk).update(
+                        claimed_by=faculty, claimed_at=now, dtm_updated=now
+                    ):
+                        claimed.append(pk)
+        return StudentAssignment.objects.filter(queue_item__in=claimed).order_by(
+            *(f"queue_item__{name}" for name in cls.PRIORITY)
+        )
+
+
+class StudentProgress(QuxModel):
+    """
+    One StudentAssignment on the timeline of its student. The assignment's
+    course and due date are copied in so a student's whole history is one
+    range scan of the timeline index, without joining Assignment.
+    """
+
+    ON_TIME = "on_time"
+    LATE = "late"
+    MISSING = "missing"
+    PENDING = "pending"
+
+    # Copied from the StudentAssignment and its assignment
+    FIELDS = (
+        "student",
+        "assignment",
+        "course",
+        "due",
+        "submitted",
+        "reviewed",
+        "grade",
+    )
+
+    student_assignment = models.OneToOneField(
+        StudentAssignment, on_delete=models.CASCADE, related_name="progress"
+    )
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="progress"
+    )
+    assignment = models.ForeignKey(
+        Assignment, on_delete=models.CASCADE, related_name="+"
+    )
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="+")
+    due = models.DateTimeField()
+    submitted = models.DateTimeField(default=None, null=True, blank=True)
+    reviewed = models.DateTimeField(default=None, null=True, blank=True)
+    grade = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=None,
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["student", "due", "id"], name="voyage_progress_timeline"
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.student_assignment_id)
+
+    def status(self, now=None):
+        """
+        on_time or late once submitted, before that pending until the due
+        date passes and missing after it. Missing depends on the clock, so
+        it is worked out on read rather than stored.
+        """
+        if self.submitted is not None:
+            return self.ON_TIME if self.submitted <= self.due else self.LATE
+        return self.MISSING if self.due < (now or timezone.now()) else self.PENDING
+
+    @staticmethod
+    def rows(ids=None):
+        """
+        (id, *FIELDS) of StudentAssignments, all of them or only ids
+        """
+        rows = StudentAssignment.objects.all()
+        if ids is not None:
+            rows = rows.filter(id__in=ids)
+        return rows.order_by().values_list(
+            "id",
+            "student_id",
+            "assignment_id",
+            "assignment__course_id",
+            "assignment__due",
+            "submitted",
+            "reviewed",
+            "grade",
+        )
+
+    @classmethod
+    def build(cls, rows):
+        """
+        Unsaved entries of rows()
+        """
+        return [
+            cls(
+                student_assignment_id=pk,
+                student_id=student_id,
+                assignment_id=assignment_id,
+                course_id=course_id,
+                due=due,
+                submitted=submitted,
+                reviewed=reviewed,
+                grade=grade,
+            )
+            for pk, student_id, assignment_id, course_id, due, submitted, reviewed, grade in rows
+        ]
+
+    @classmethod
+    def sync(cls, ids):
+        """
+        Upserts the entries of the StudentAssignments ids in one statement
+        """
+        conflict = {}
+        if connection.features.supports_update_conflicts_with_target:
+            conflict["unique_fields"] = ["student_assignment"]
+        cls.objects.bulk_create(
+            cls.build(cls.rows(list(ids))),
+            update_conflicts=True,
+            update_fields=[*cls.FIELDS, "dtm_updated"],
+            **conflict,
+        )
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        """
+        Recomputes every timeline from StudentAssignment rows
+        """
+        count = 0
+        with transaction.atomic():
+            cls.objects.all().delete()
+            for chunk in chunked(
+                cls.rows().iterator(chunk_size=batch_size), batch_size
+            ):
+                count += len(cls.objects.bulk_create(cls.build(chunk)))
+        return count
+
+
+class GradeSummary(QuxModel):
+    """
+    Running submission and grade totals over StudentAssignment rows
+    """
+
+    field = None
+    key = None
+
+    num_submitted = models.PositiveIntegerField(default=0)
+    num_graded = models.PositiveIntegerField(default=0)
+    grade_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def avg_grade(self):
+        """
+        Average grade of the graded submissions
+        """
+        if self.num_graded:
+            return round(self.grade_total / self.num_graded, 2)
+        return 0
+
+    @classmethod
+    def contribution(cls, row):
+        """
+        Values a single StudentAssignment adds to its summary
+        """
+        grade = StudentAssignment._meta.get_field("grade").to_python(row.grade)
+        return {
+            "num_submitted": int(row.submitted is not None),
+            "num_graded": int(grade is not None),
+            "grade_total": (grade or Decimal(0)).quantize(Decimal("0.01")),
+        }
+
+    @classmethod
+    def changes(cls, pairs):
+        """
+        {summarised id: deltas} moving the contribution of each (old, new)
+        pair of StudentAssignment states, None standing for no row
+        """
+        changes = {}
+        for old, new in pairs:
+            for row, sign in ((old, -1), (new, 1)):
+                if row is None or getattr(row, f"{cls.key}_id") is None:
+                    continue
+                deltas = changes.setdefault(getattr(row, f"{cls.key}_id"), {})
+                for name, value in cls.contribution(row).items():
+                    deltas[name] = deltas.get(name, 0) + sign * value
+        return {
+            pk: {name: value for name, value in deltas.items() if value}
+            for pk, deltas in changes.items()
+        }
+
+    @classmethod
+    def apply_many(cls, changes):
+        """
+        Adds the changes of many summaries in one UPDATE. Summaries that do
+        not exist yet are rebuilt from the raw rows instead.
+        """
+        changes = {pk: deltas for pk, deltas in changes.items() if deltas}
+        existing = set(
+            cls.objects.filter(**{f"{cls.field}__in": list(changes)}).values_list(
+                f"{cls.field}_id", flat=True
+            )
+        )
+        names = ["num_submitted", "num_graded", "grade_total"]
+        now = timezone.now()
+        update_from_values(
+            cls,
+            cls.field,
+            [*names, "dtm_updated"],
+            [
+                (pk, *(changes[pk].get(name, 0) for name in names), now)
+                for pk in existing
+            ],
+            add=names,
+        )
+        missing = changes.keys() - existing
+        if missing:
+            cls.rebuild(missing)
+
+    @classmethod
+    def apply(cls, pk, deltas, create=True):
+        """
+        Adds deltas to the summary of pk, creating the summary on first use
+        """
+        lookup = {f"{cls.field}_id": pk}
+        changes = {name: F(name) + value for name, value in deltas.items()}
+        changes["dtm_updated"] = timezone.now()
+        if cls.objects.filter(**lookup).update(**changes) or not create:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(**lookup, **deltas)
+        except IntegrityError:
+            cls.objects.filter(**lookup).update(**changes)
+
+    @classmethod
+    def aggregate(cls, rows):
+        """
+        Summary values of the StudentAssignment queryset rows, keyed by
+        summarised id
+        """
+        rows = (
+            rows.filter(**{f"{cls.key}__isnull": False})
+            .order_by()
+            .values(cls.key)
+            .annotate(
+                num_submitted=Count("submitted"),
+                num_graded=Count("grade"),
+                grade_total=Coalesce(
+                    Sum("grade"),
+                    Value(Decimal(0)),
+                    output_field=models.DecimalField(max_digits=14, decimal_places=2),
+                ),
+            )
+        )
+        totals = {}
+        for row in rows:
+            # SQLite sums decimals as floats, e.g. 20245.8000000001
+            row["grade_total"] = row["grade_total"].quantize(Decimal("0.01"))
+            totals[row.pop(cls.key)] = row
+        return totals
+
+    @classmethod
+    def expected(cls, ids=None):
+        """
+        Summary values computed from the raw rows, keyed by summarised id
+        """
+        rows = StudentAssignment.objects.all()
+        if ids is not None:
+            rows = rows.filter(**{f"{cls.key}__in": ids})
+        return cls.aggregate(rows)
+
+    @staticmethod
+    def difference(before, after):
+        """
+        {summarised id: deltas} taking the aggregate before to after
+        """
+        zero = {"num_submitted": 0, "num_graded": 0, "grade_total": 0}
+        changes = {}
+        for pk in before.keys() | after.keys():
+            old, new = before.get(pk, zero), after.get(pk, zero)
+            deltas = {name: new[name] - old[name] for name in zero}
+            changes[pk] = {name: value for name, value in deltas.items() if value}
+        return changes
+
+    @classmethod
+    def rebuild(cls, ids=None):
+        """
+        Recomputes the summaries from scratch, all of them or only ids
+        """
+        with transaction.atomic():
+            expected = cls.expected(ids)
+            stale = cls.objects.all()
+            if ids is not None:
+                stale = stale.filter(**{f"{cls.field}__in": ids})
+            stale.delete()
+            cls.objects.bulk_create(
+                [
+                    cls(**{f"{cls.field}_id": pk}, **values)
+                    for pk, values in expected.items()
+                ],
+                batch_size=1000,
+            )
+            # Once for the whole rebuild, a delete signal would load every
+            # stale row and bump per row
+            invalidate_pages()
+        return len(expected)
+
+    @classmethod
+    def drift(cls):
+        """
+        Ids whose stored summary no longer matches the raw rows
+        """
+        zero = {"num_submitted": 0, "num_graded": 0, "grade_total": 0}
+        expected = cls.expected()
+        stored = {
+            row.pop(cls.field): row for row in cls.objects.values(cls.field, *zero)
+        }
+        return sorted(
+            pk
+            for pk in expected.keys() | stored.keys()
+            if expected.get(pk, zero) != stored.get(pk, zero)
+        )
+
+
+class StudentGradeSummary(GradeSummary):
+    """
+    Submission and grade totals of a student
+    """
+
+    field = "student"
+    key = "student"
+
+    student = models.OneToOneField(
+        Student, on_delete=models.CASCADE, related_name="grade_summary"
+    )
+
+
+class AssignmentGradeSummary(GradeSummary):
+    """
+    Submission and grade totals of an assignment
+    """
+
+    field = "assignment"
+    key = "assignment"
+
+    assignment = models.OneToOneField(
+        Assignment, on_delete=models.CASCADE, related_name="grade_summary"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["dtm_updated"], name="voyage_asg_summary_updated")
+        ]
+
+
+class FacultyGradeSummary(GradeSummary):
+    """
+    Submission and grade totals of the assignments a faculty reviewed
+    """
+
+    field = "faculty"
+    key = "reviewer"
+
+    faculty = models.OneToOneField(
+        Faculty, on_delete=models.CASCADE, related_name="grade_summary"
+    )
+
+
 def create_random_data():
     """
     Generates Random Data
@@ -0,0 +1,201 @@
+"""
+serializers.py
+"""
+
+from rest_framework import serializers
+
+from .models import (
+    Program,
+    Course,
+    Student,
+    Assignment,
+    StudentAssignment,
+    GradingQueueItem,
+    StudentProgress,
+)
+
+
+class GradeSerializer(serializers.Serializer):
+    """
+    One row of a bulk grading request
+    """
+
+    # pylint: disable=abstract-method
+
+    student_assignment_id = serializers.IntegerField(min_value=1)
+    grade = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=0)
+    # Left out of validated_data when not sent, keeping the stored feedback
+    feedback = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+
+class ClaimSerializer(serializers.Serializer):
+    """
+    How many queued submissions to claim
+    """
+
+    # pylint: disable=abstract-method
+
+    count = serializers.IntegerField(min_value=1, max_value=100, default=1)
+
+
+class SparseFieldsSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer limited to the ?fields= of the request.
+
+    related maps field names to the relations they read, so views can
+    select_related only what the requested fields need.
+    """
+
+    related = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.requested_fields(self.context.get("request"))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+    @staticmethod
+    def requested_fields(request):
+        """
+        Set of field names asked for, None for all
+        """
+        if request is None or not request.query_params.get("fields"):
+            return None
+        return {i.strip() for i in request.query_params["fields"].split(",")}
+
+    @classmethod
+    def select_related_for(cls, request):
+        """
+        Relations to select_related for the fields of request
+        """
+        fields = cls.requested_fields(request)
+        return sorted(
+            {
+                path
+                for name, path in cls.related.items()
+                if fields is None or name in fields
+            }
+        )
+
+
+class ProgramSerializer(SparseFieldsSerializer):
+    """
+    Program
+    """
+
+    class Meta:
+        model = Program
+        fields = ["id", "name", "start", "end", "dtm_updated"]
+
+
+class CourseSerializer(SparseFieldsSerializer):
+    """
+    Course
+    """
+
+    class Meta:
+        model = Course
+        fields = ["id", "name", "dtm_updated"]
+
+
+class StudentSerializer(SparseFieldsSerializer):
+    """
+    Student
+    """
+
+    related = {"username": "user"}
+
+    username = serializers.CharField(source="user.username", read_only=True)
+
+    class Meta:
+        model = Student
+        fields = ["id", "username", "github", "is_active", "program", "dtm_updated"]
+
+
+class AssignmentSerializer(SparseFieldsSerializer):
+    """
+    Assignment
+    """
+
+    related = {"name": "content"}
+
+    name = serializers.CharField(source="content.name", read_only=True)
+
+    class Meta:
+        model = Assignment
+        fields = [
+            "id",
+            "name",
+            "program",
+            "course",
+            "content",
+            "due",
+            "instructions",
+            "rubric",
+            "dtm_updated",
+        ]
+
+
+class StudentAssignmentSerializer(SparseFieldsSerializer):
+    """
+    StudentAssignment
+    """
+
+    class Meta:
+        model = StudentAssignment
+        fields = [
+            "id",
+            "student",
+            "assignment",
+            "grade",
+            "submitted",
+            "reviewed",
+            "reviewer",
+            "feedback",
+            "dtm_updated",
+        ]
+
+
+class GradingQueueItemSerializer(SparseFieldsSerializer):
+    """
+    GradingQueueItem
+    """
+
+    class Meta:
+        model = GradingQueueItem
+        fields = [
+            "id",
+            "student_assignment",
+            "due",
+            "submitted",
+            "claimed_by",
+            "claimed_at",
+        ]
+
+
+class StudentProgressSerializer(serializers.ModelSerializer):
+    """
+    StudentProgress, with its status at the context's now
+    """
+
+    status = serializers.SerializerMethodField()
+
+    class Meta:
+        model = StudentProgress
+        fields = [
+            "student_assignment",
+            "assignment",
+            "course",
+            "due",
+            "submitted",
+            "reviewed",
+            "grade",
+            "status",
+        ]
+
+    def get_status(self, obj):
+        """
+        on_time, late, missing or pending
+        """
+        return obj.status(self.context.get("now"))
@@ -0,0 +1,164 @@
+"""
+signals.py
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    Assignment,
+    Content,
+    Course,
+    Faculty,
+    GradingQueueItem,
+    Program,
+    Student,
+    StudentAssignment,
+    StudentProgress,
+    StudentGradeSummary,
+    AssignmentGradeSummary,
+    FacultyGradeSummary,
+)
+from .utils.cache import invalidate_pages, invalidate_rosters
+
+GRADE_SUMMARIES = (StudentGradeSummary, AssignmentGradeSummary, FacultyGradeSummary)
+
+# StudentAssignment fields the grading queue and progress timelines copy
+TRACKED_FIELDS = ("student_id", "assignment_id", "submitted", "reviewed", "grade")
+
+
+def update_grade_summaries(old, new):
+    """
+    Moves the contribution of a StudentAssignment from its old to its new state
+    """
+    for summary in GRADE_SUMMARIES:
+        for pk, deltas in summary.changes([(old, new)]).items():
+            if deltas:
+                # Only rows that grow a summary may create it, a delete
+                # cascading from the summarised object must not resurrect it
+                summary.apply(pk, deltas, create=min(deltas.values()) > 0)
+
+
+@receiver(pre_save, sender=StudentAssignment)
+def remember_student_assignment(sender, instance, **kwargs):
+    """
+    Keeps the stored state of the row to diff against after saving
+    """
+    instance._previous = None
+    if instance.pk:
+        instance._previous = (
+            StudentAssignment.objects.filter(pk=instance.pk)
+            .only("student", "assignment", "reviewer", "grade", "submitted", "reviewed")
+            .first()
+        )
+
+
+@receiver(post_save, sender=StudentAssignment)
+def student_assignment_saved(sender, instance, **kwargs):
+    """
+    Updates the grade summaries, grading queue and progress timeline of a
+    saved StudentAssignment
+    """
+    previous = getattr(instance, "_previous", None)
+    update_grade_summaries(previous, instance)
+    if previous is None or any(
+        getattr(previous, name) != getattr(instance, name) for name in TRACKED_FIELDS
+    ):
+        GradingQueueItem.sync([instance.pk])
+        StudentProgress.sync([instance.pk])
+
+
+@receiver(post_delete, sender=StudentAssignment)
+def student_assignment_deleted(sender, instance, **kwargs):
+    """
+    Updates the grade summaries of a deleted StudentAssignment
+    """
+    update_grade_summaries(instance, None)
+
+
+@receiver(post_save, sender=Assignment)
+def assignment_saved(sender, instance, created, **kwargs):
+    """
+    Queued rows and progress timelines carry the due date, faculty and
+    course of their assignment
+    """
+    if not created:
+        GradingQueueItem.objects.filter(student_assignment__assignment=instance).update(
+            due=instance.due, faculty=instance.content.faculty_id
+        )
+        StudentProgress.objects.filter(assignment=instance).update(
+            due=instance.due, course=instance.course_id
+        )
+
+
+@receiver(post_save, sender=Content)
+def content_saved(sender, instance, created, **kwargs):
+    """
+    Queued rows follow their content to its new faculty
+    """
+    if not created:
+        GradingQueueItem.objects.filter(
+            student_assignment__assignment__content=instance
+        ).exclude(faculty=instance.faculty_id).update(faculty=instance.faculty_id)
+
+
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+@receiver(post_delete, sender=Student)
+def roster_changed(sender, **kwargs):
+    """
+    Assignments link programs to courses, every roster may have changed
+    """
+    invalidate_rosters()
+
+
+@receiver(pre_save, sender=Student)
+def remember_student_program(sender, instance, **kwargs):
+    """
+    Keeps the stored program to detect moves between programs
+    """
+    instance._previous_program_id = None
+    if instance.pk:
+        instance._previous_program_id = (
+            Student.objects.filter(pk=instance.pk)
+            .values_list("program_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Student)
+def student_saved(sender, instance, created, **kwargs):
+    """
+    New students and program moves change course rosters
+    """
+    if created or instance.program_id != instance._previous_program_id:
+        invalidate_rosters()
+
+
+# Models the cached pages and API responses render, saving or deleting a
+# row of any moves them to a new version
+PAGE_MODELS = (
+    get_user_model(),
+    Faculty,
+    Program,
+    Course,
+    Content,
+    Student,
+    Assignment,
+    StudentAssignment,
+)
+
+
+def page_rows_changed(sender, update_fields=None, **kwargs):
+    """
+    Rendered rows changed, cached pages and API validators move to a new
+    version. Logins only touch last_login, which nothing renders.
+    """
+    if update_fields is None or set(update_fields) != {"last_login"}:
+        invalidate_pages()
+
+
+for model in PAGE_MODELS:
+    post_save.connect(page_rows_changed, sender=model)
+    post_delete.connect(page_rows_changed, sender=model)
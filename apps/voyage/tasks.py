@@ -0,0 +1,111 @@
+"""
+tasks.py
+"""
+
+import hashlib
+
+from celery import shared_task
+from django.conf import settings
+
+from .models import Course, Faculty, Program
+from .utils.batch import chunked
+from .utils.reports import (
+    grade_distributions,
+    grading_backlogs,
+    run_once,
+    store_reports,
+    submission_rates,
+)
+from .utils.reposync import sync_repos
+
+
+def chunk_size():
+    """
+    Number of ids handed to one report task
+    """
+    return getattr(settings, "REPORT_CHUNK_SIZE", 100)
+
+
+def lock_name(name, ids):
+    """
+    Lock of one report over ids, equal for equal id sets. The ids are
+    hashed, a chunk of them would overflow the 250 characters memcached
+    allows in a key.
+    """
+    digest = hashlib.sha1(
+        ",".join(str(i) for i in sorted(ids)).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"{name}:{digest}"
+
+
+@shared_task
+def course_grade_distributions(course_ids):
+    """
+    Caches the grade distribution of each course in course_ids
+    """
+    with run_once(lock_name("grades", course_ids)) as acquired:
+        if not acquired:
+            return 0
+        return store_reports("grades", grade_distributions(course_ids))
+
+
+@shared_task
+def faculty_grading_backlogs(faculty_ids):
+    """
+    Caches the grading backlog of each faculty in faculty_ids
+    """
+    with run_once(lock_name("backlog", faculty_ids)) as acquired:
+        if not acquired:
+            return 0
+        return store_reports("backlog", grading_backlogs(faculty_ids))
+
+
+@shared_task
+def program_submission_rates(program_ids, days=None):
+    """
+    Caches the daily submission counts of each program in program_ids
+    """
+    days = days or getattr(settings, "REPORT_DAYS", 90)
+    with run_once(lock_name(f"submissions:{days}", program_ids)) as acquired:
+        if not acquired:
+            return 0
+        return store_reports("submissions", submission_rates(program_ids, days))
+
+
+# report task and the model its ids come from
+REPORT_TASKS = (
+    (course_grade_distributions, Course),
+    (faculty_grading_backlogs, Faculty),
+    (program_submission_rates, Program),
+)
+
+
+@shared_task
+def precompute_reports():
+    """
+    Fans every report out in chunks of REPORT_CHUNK_SIZE ids. Each chunk
+    is its own task, so a failure only retries its chunk.
+    """
+    with run_once("precompute") as acquired:
+        if not acquired:
+            return 0
+        queued = 0
+        for task, model in REPORT_TASKS:
+            ids = model.objects.order_by("id").values_list("id", flat=True)
+            for chunk in chunked(ids.iterator(), chunk_size()):
+                task.delay(chunk)
+                queued += 1
+        return queued
+
+
+@shared_task
+def sync_student_repos():
+    """
+    Marks assignments submitted from new commits in the student repos
+    """
+    with run_once(
+        "reposync", getattr(settings, "REPO_SYNC_LOCK_TIMEOUT", 3600)
+    ) as acquired:
+        if not acquired:
+            return None
+        return sync_repos()
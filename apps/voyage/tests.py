@@ -0,0 +1,1328 @@
+"""
+tests.py
+"""
+
+import asyncio
+import datetime
+import json
+import threading
+import time
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .management.commands.benchmark_voyage import Command
+from .tasks import lock_name
+from .models import (
+    Faculty,
+    Program,
+    Course,
+    Content,
+    Student,
+    Assignment,
+    StudentAssignment,
+    StudentCourseRepo,
+    GradingQueueItem,
+    StudentProgress,
+    StudentGradeSummary,
+    AssignmentGradeSummary,
+    FacultyGradeSummary,
+)
+from .signals import GRADE_SUMMARIES
+from .utils.batch import update_from_values
+from .utils.cache import page_version
+from .utils.grading import ClaimedError, apply_grades
+from .utils.onboarding import import_students
+from .utils.reposync import HttpBackend, RepoBackend, check_repos, sync_repos
+
+# Rows per model the query counts are compared at
+SIZES = (10, 100, 1000)
+
+# Most queries a voyage route may run on a cache miss
+QUERY_BUDGET = 10
+
+
+def seed(start, stop):
+    """
+    Rows start to stop of every voyage model, created in bulk, with the
+    grade summaries, grading queue and progress timelines rebuilt over them
+    """
+    now = timezone.now()
+    rows = range(start, stop)
+    user_model = get_user_model()
+    users = user_model.objects.bulk_create(
+        [user_model(username=f"faculty{i}") for i in rows]
+        + [user_model(username=f"student{i}") for i in rows]
+    )
+    faculty = Faculty.objects.bulk_create(
+        [Faculty(user=user, github=f"faculty{i}") for i, user in zip(rows, users)]
+    )
+    programs = Program.objects.bulk_create(
+        [Program(name=f"Program {i}", start=now, end=now) for i in rows]
+    )
+    courses = Course.objects.bulk_create([Course(name=f"Course {i}") for i in rows])
+    contents = Content.objects.bulk_create(
+        [
+            Content(
+                name=f"Content {i}",
+                faculty=faculty[n],
+                repo=f"https://github.com/voyage/content{i}",
+            )
+            for n, i in enumerate(rows)
+        ]
+    )
+    students = Student.objects.bulk_create(
+        [
+            Student(user=user, github=f"student{i}", program=programs[n])
+            for n, (i, user) in enumerate(zip(rows, users[len(rows) :]))
+        ]
+    )
+    assignments = Assignment.objects.bulk_create(
+        [
+            Assignment(
+                program=programs[n],
+                course=courses[n],
+                content=contents[n],
+                due=now - datetime.timedelta(days=i % 30),
+                instructions="",
+                rubric="",
+            )
+            for n, i in enumerate(rows)
+        ]
+    )
+    # Every other row submitted, every fourth graded by its content's faculty
+    StudentAssignment.objects.bulk_create(
+        [
+            StudentAssignment(
+                student=students[n],
+                assignment=assignments[n],
+                submitted=now if i % 2 == 0 else None,
+                grade=i % 1000 if i % 4 == 0 else None,
+                reviewed=now if i % 4 == 0 else None,
+                reviewer=faculty[n] if i % 4 == 0 else None,
+            )
+            for n, i in enumerate(rows)
+        ]
+    )
+    StudentCourseRepo.objects.bulk_create(
+        [
+            StudentCourseRepo(
+                student=students[n],
+                course=courses[n],
+                repo=f"https://github.com/student{i}/course-{i}",
+            )
+            for n, i in enumerate(rows)
+        ]
+    )
+    for summary in GRADE_SUMMARIES:
+        summary.rebuild()
+    GradingQueueItem.rebuild()
+    StudentProgress.rebuild()
+
+
+class AdminChangelistTest(TestCase):
+    """
+    Admin changelists run the same number of queries whatever the number
+    of rows, a query per row shows up as a count growing with the size
+    """
+
+    changelists = (
+        "faculty",
+        "student",
+        "content",
+        "program",
+        "course",
+        "assignment",
+        "studentassignment",
+        "studentcourserepo",
+        "gradingqueueitem",
+    )
+
+    def setUp(self):
+        self.client.force_login(
+            get_user_model().objects.create_superuser("admin", "admin@example.com")
+        )
+
+    def test_queries_constant(self):
+        """
+        Counts the queries of every changelist at the first size, asserts
+        the same counts at the larger ones
+        """
+        expected = {}
+        seeded = 0
+        for size in SIZES:
+            seed(seeded, size)
+            seeded = size
+            for name in self.changelists:
+                url = f"/admin/voyage/{name}/"
+                with self.subTest(changelist=name, size=size):
+                    if name not in expected:
+                        with CaptureQueriesContext(connection) as queries:
+                            response = self.client.get(url)
+                        expected[name] = len(queries)
+                    else:
+                        with self.assertNumQueries(expected[name]):
+                            response = self.client.get(url)
+                    self.assertEqual(response.status_code, 200)
+
+
+class IndexUsageTest(TestCase):
+    """
+    The Student, Assignment and Faculty predicates on StudentAssignment
+    search their composite index instead of scanning the table
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(0, 200)
+
+    def test_predicates_use_indexes(self):
+        """
+        Asserts the index named in each query plan
+        """
+        student = Student.objects.first()
+        assignment = Assignment.objects.first()
+        faculty = Faculty.objects.first()
+        cases = (
+            (student.assignments_submitted(), "voyage_sa_student_submitted"),
+            (student.assignments_not_submited(), "voyage_sa_student_submitted"),
+            (student.assignments_graded(), "voyage_sa_student_grade"),
+            (assignment.submissions(), "voyage_sa_assignment_grade"),
+            (assignment.submissions(graded=True), "voyage_sa_assignment_grade"),
+            (faculty.assignments_graded(), "voyage_sa_reviewer_grade"),
+        )
+        for queryset, index in cases:
+            with self.subTest(query=str(queryset.query)):
+                self.assertIn(index, queryset.explain())
+
+
+class ListViewQueriesTest(TestCase):
+    """
+    The course, student and submission lists run the same number of
+    queries for a course of 10 or 100 students and assignments
+    """
+
+    sizes = (10, 100)
+
+    def course(self, size):
+        """
+        A course of size assignments in one program of size students, each
+        student with one submission, returns the course and first student
+        """
+        now = timezone.now()
+        user_model = get_user_model()
+        course = Course.objects.create(name=f"Course of {size}")
+        program = Program.objects.create(name=f"Program of {size}", start=now, end=now)
+        users = user_model.objects.bulk_create(
+            [user_model(username=f"faculty{size}.{i}") for i in range(size)]
+            + [user_model(username=f"student{size}.{i}") for i in range(size)]
+        )
+        faculty = Faculty.objects.bulk_create(
+            [
+                Faculty(user=user, github=f"faculty{size}.{i}")
+                for i, user in enumerate(users[:size])
+            ]
+        )
+        students = Student.objects.bulk_create(
+            [
+                Student(user=user, github=f"student{size}.{i}", program=program)
+                for i, user in enumerate(users[size:])
+            ]
+        )
+        contents = Content.objects.bulk_create(
+            [
+                Content(
+                    name=f"Content {size}.{i}",
+                    faculty=faculty[i],
+                    repo=f"https://github.com/voyage/content{size}.{i}",
+                )
+                for i in range(size)
+            ]
+        )
+        assignments = Assignment.objects.bulk_create(
+            [
+                Assignment(
+                    program=program,
+                    course=course,
+                    content=content,
+                    due=now,
+                    instructions="",
+                    rubric="",
+                )
+                for content in contents
+            ]
+        )
+        StudentAssignment.objects.bulk_create(
+            [
+                StudentAssignment(student=student, assignment=assignment, submitted=now)
+                for student, assignment in zip(students, assignments)
+            ]
+        )
+        return course, students[0]
+
+    def test_queries_constant(self):
+        """
+        Counts the queries of every view at the first size, asserts the
+        same counts at the second
+        """
+        expected = {}
+        for size in self.sizes:
+            course, student = self.course(size)
+            urls = {
+                "num_students": f"/voyage/num_students/{course.pk}",
+                "num_assignments": f"/voyage/num_assignments/{course.pk}",
+                "student_assignments": (
+                    f"/voyage/student_assignments/{student.pk}/{course.pk}"
+                ),
+                "submissions": "/voyage/submissions/",
+            }
+            for name, url in urls.items():
+                # Nothing cached at the first size may spare queries later
+                cache.clear()
+                with self.subTest(view=name, size=size):
+                    if name not in expected:
+                        with CaptureQueriesContext(connection) as queries:
+                            response = self.client.get(url)
+                        expected[name] = len(queries)
+                    else:
+                        with self.assertNumQueries(expected[name]):
+                            response = self.client.get(url)
+                    self.assertEqual(response.status_code, 200)
+
+
+class RosterCacheTest(TestCase):
+    """
+    Cached rosters follow assignment and program changes, course students
+    are always read live
+    """
+
+    def setUp(self):
+        cache.clear()
+        seed(0, 3)
+        self.student = Student.objects.get(github="student0")
+        self.programs = list(Program.objects.order_by("id"))
+        self.courses = list(Course.objects.order_by("id"))
+
+    def link(self, program, course):
+        """
+        Assignment of program in course, saved with its commit callbacks run
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            return Assignment.objects.create(
+                program=program,
+                course=course,
+                content=Content.objects.first(),
+                due=timezone.now(),
+                instructions="",
+                rubric="",
+            )
+
+    def test_student_courses(self):
+        """
+        Courses are read from the cache until an assignment or the
+        student's program changes
+        """
+        self.assertEqual(list(self.student.courses()), self.courses[:1])
+        with self.assertNumQueries(1):
+            self.assertEqual(list(self.student.courses()), self.courses[:1])
+        assignment = self.link(self.programs[0], self.courses[1])
+        self.assertEqual(set(self.student.courses()), set(self.courses[:2]))
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.delete()
+        self.assertEqual(list(self.student.courses()), self.courses[:1])
+        self.student.program = self.programs[2]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.save()
+        self.assertEqual(list(self.student.courses()), self.courses[2:])
+
+    def test_course_programs(self):
+        """
+        Programs follow the assignments linking them to the course
+        """
+        course = self.courses[0]
+        self.assertEqual(list(course.programs()), self.programs[:1])
+        self.link(self.programs[1], course)
+        self.assertEqual(set(course.programs()), set(self.programs[:2]))
+
+    def test_course_students(self):
+        """
+        Students are a live queryset, new ones show without invalidation
+        """
+        course = self.courses[0]
+        self.assertEqual(list(course.students()), [self.student])
+        user = get_user_model().objects.create(username="late")
+        late = Student.objects.bulk_create(
+            [Student(user=user, github="late", program=self.programs[0])]
+        )[0]
+        self.assertEqual(set(course.students()), {self.student, late})
+
+
+class PageCacheTest(TestCase):
+    """
+    A cached page costs one query of its key and moves to a new key when
+    a row of its models is deleted
+    """
+
+    def setUp(self):
+        cache.clear()
+        seed(0, 10)
+
+    def test_hit_and_delete(self):
+        """
+        Serves the students page from the cache, then without the
+        deleted student
+        """
+        self.client.get("/voyage/students/")
+        with self.assertNumQueries(1):
+            response = self.client.get("/voyage/students/")
+        self.assertContains(response, "student0")
+        # The oldest row, its delete leaves the latest dtm_updated as it was
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.order_by("dtm_updated", "id").first().delete()
+        self.assertNotContains(self.client.get("/voyage/students/"), "student0<")
+
+    def test_related_save(self):
+        """
+        Renaming the user of a listed student renders the new name
+        """
+        self.client.get("/voyage/students/")
+        user = Student.objects.get(github="student3").user
+        user.username = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertContains(self.client.get("/voyage/students/"), "renamed<")
+
+    def test_summary_rebuild(self):
+        """
+        A summary rebuild deletes its rows in one statement and moves the
+        pages on once
+        """
+        before = page_version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with CaptureQueriesContext(connection) as queries:
+                AssignmentGradeSummary.rebuild()
+        deletes = [query for query in queries if query["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 1)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(page_version(), before + 1)
+
+
+class ConditionalGetTest(TestCase):
+    """
+    API responses answer 304 until a rendered row is saved or deleted
+    """
+
+    url = "/api/voyage/students/"
+
+    def setUp(self):
+        cache.clear()
+        seed(0, 10)
+        self.faculty = Faculty.objects.get(github="faculty0")
+        self.client.force_login(self.faculty.user)
+
+    def assertChanged(self, etag, change):
+        """
+        The list answers 304 to etag before change and 200 after it, returns
+        the new ETag
+        """
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return response["ETag"]
+
+    def test_not_modified(self):
+        """
+        The ETag of a 200 gets a 304 without touching the listed rows
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Last-Modified", response)
+        etag = response["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(
+            [query for query in queries if "voyage_student" in query["sql"]]
+        )
+
+    def test_changes(self):
+        """
+        Saves and deletes of listed and related rows move the ETag, a login
+        does not
+        """
+        etag = self.client.get(self.url)["ETag"]
+        student = Student.objects.get(github="student3")
+        student.github = "renamed"
+        etag = self.assertChanged(etag, student.save)
+        user = student.user
+        user.username = "renamed"
+        etag = self.assertChanged(etag, user.save)
+        etag = self.assertChanged(etag, Student.objects.get(github="student4").delete)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.force_login(user)
+            self.client.force_login(self.faculty.user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class BenchmarkTest(TestCase):
+    """
+    Every voyage route measured the way benchmark_voyage does, as staff
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(0, 50)
+        cls.staff = get_user_model().objects.create_user("benchmark", is_staff=True)
+
+    def test_routes(self):
+        """
+        Every route answers 200 to staff within the query budget, the
+        reported timings are ordered
+        """
+        for name, path in Command.routes():
+            with self.subTest(route=name):
+                result = Command.measure(name, path, 3, self.staff)
+                self.assertEqual(result["status"], 200)
+                self.assertLessEqual(result["queries"], QUERY_BUDGET)
+                self.assertLessEqual(result["wall_ms_min"], result["wall_ms_median"])
+                self.assertLessEqual(result["warm_ms_min"], result["warm_ms_median"])
+
+    def test_streamed_body_measured(self):
+        """
+        The gradebook export streams, its queries and bytes are those of
+        the consumed stream
+        """
+        client = Client()
+        client.force_login(self.staff)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/voyage/gradebook/")
+            body = b"".join(response.streaming_content)
+        result = Command.measure(
+            "gradebook_export", "/voyage/gradebook/", 1, self.staff
+        )
+        self.assertEqual(result["queries"], len(queries))
+        self.assertEqual(result["bytes"], len(body))
+
+
+class QueryInstrumentationTest(TestCase):
+    """
+    The instrumentation middleware counts the queries of streamed bodies
+    """
+
+    def setUp(self):
+        seed(0, 20)
+        staff = get_user_model().objects.create_user("staff", is_staff=True)
+        self.client.force_login(staff)
+
+    def test_streamed_queries_logged(self):
+        """
+        The log line of the gradebook export, written when its stream
+        closes, counts the queries run while iterating it
+        """
+        with self.assertLogs("project.middleware", "INFO") as logs:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get("/voyage/gradebook/")
+                self.assertEqual(logs.records, [])
+                b"".join(response.streaming_content)
+                response.close()
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].queries, len(queries))
+        self.assertEqual(connection.execute_wrappers, [])
+
+
+class FakeBackend(RepoBackend):
+    """
+    Repos held in memory as {repo: (etag, {path: commit time})}, every
+    request recorded
+    """
+
+    def __init__(self, repos):
+        self.repos = repos
+        self.requests = []
+
+    async def head(self, repo, etag):
+        self.requests.append(("head", repo))
+        current = self.repos[repo][0]
+        return current != etag, current
+
+    async def last_commit(self, repo, path):
+        self.requests.append(("last_commit", repo, path))
+        return self.repos[repo][1].get(path)
+
+
+class RepoSyncTest(TestCase):
+    """
+    sync_repos marks committed assignments submitted and keeps the grade
+    summaries, grading queue and progress timelines in step
+    """
+
+    def setUp(self):
+        seed(0, 4)
+        # Odd rows are unsubmitted, the first of them already has a reviewer
+        self.row = StudentAssignment.objects.get(student__github="student1")
+        StudentAssignment.objects.filter(id=self.row.id).update(
+            reviewer=Faculty.objects.get(github="faculty0")
+        )
+        self.repo = StudentCourseRepo.objects.get(student__github="student1")
+        self.commit = timezone.now().replace(microsecond=0)
+
+    def test_submits_committed(self):
+        """
+        A commit in the assignment's directory submits it, every summary
+        matches the raw rows afterwards
+        """
+        backend = FakeBackend(
+            {
+                self.repo.repo: ("v1", {"content-1": self.commit}),
+                "https://github.com/student3/course-3": ("v1", {}),
+            }
+        )
+        self.assertEqual(sync_repos(backend=backend), (2, 1))
+        self.row.refresh_from_db()
+        self.repo.refresh_from_db()
+        self.assertEqual(self.row.submitted, self.commit)
+        self.assertEqual(self.repo.etag, "v1")
+        for summary in GRADE_SUMMARIES:
+            self.assertEqual(summary.drift(), [], summary.__name__)
+        self.assertTrue(
+            GradingQueueItem.objects.filter(student_assignment=self.row).exists()
+        )
+        self.assertEqual(
+            StudentProgress.objects.get(student_assignment=self.row).submitted,
+            self.commit,
+        )
+
+    def test_unchanged_etag(self):
+        """
+        A repo whose head still matches its etag is not read any further
+        """
+        backend = FakeBackend({self.repo.repo: ("v1", {})})
+        StudentCourseRepo.objects.exclude(id=self.repo.id).delete()
+        self.assertEqual(sync_repos(backend=backend), (1, 0))
+        backend.requests.clear()
+        self.assertEqual(sync_repos(backend=backend), (1, 0))
+        self.assertEqual(backend.requests, [("head", self.repo.repo)])
+
+
+class FakeCommitsHandler(BaseHTTPRequestHandler):
+    """
+    GitHub commits API of one repo, head "v1", answering If-None-Match
+    with 304 and requests for /limited with a spent rate limit
+    """
+
+    commit = {"commit": {"committer": {"date": "2026-01-02T03:04:05Z"}}}
+
+    def do_GET(self):
+        """
+        Answers one commits request
+        """
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if "/limited/" in self.path:
+            self.send_response(403)
+            self.send_header("X-RateLimit-Remaining", "0")
+            self.send_header("X-RateLimit-Reset", str(int(time.time()) + 60))
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == "v1":
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps([self.commit]).encode()
+        self.send_response(200)
+        self.send_header("ETag", "v1")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """
+        Keeps the test output quiet
+        """
+
+
+class HttpBackendTest(SimpleTestCase):
+    """
+    HttpBackend against a local stand-in for the GitHub commits API
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeCommitsHandler)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.backend = HttpBackend(url=f"http://127.0.0.1:{self.server.server_port}")
+
+    def check(self, repo):
+        """
+        Result of check_repos over repo and its one pending path
+        """
+        return asyncio.run(check_repos(self.backend, {repo: [(1, "content-1")]}, 2))
+
+    def test_etag(self):
+        """
+        A changed head reads the path's last commit and stores the etag,
+        the next check stops at the 304 of the head
+        """
+        repo = StudentCourseRepo(
+            id=1, repo="https://github.com/student1/course-1", etag=""
+        )
+        [(_, submitted)] = self.check(repo)
+        self.assertEqual(
+            submitted,
+            {1: datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)},
+        )
+        self.assertEqual(repo.etag, "v1")
+        self.server.requests.clear()
+        self.assertEqual(self.check(repo), [(repo, {})])
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.server.requests[0][1], "v1")
+
+    def test_rate_limited(self):
+        """
+        A spent rate limit skips the repo and every request until reset
+        """
+        repo = StudentCourseRepo(
+            id=2, repo="https://github.com/limited/course-1", etag=""
+        )
+        self.assertEqual(self.check(repo), [])
+        self.assertEqual(self.check(repo), [])
+        self.assertEqual(len(self.server.requests), 1)
+
+
+class GradeSummaryTest(TestCase):
+    """
+    The signals keep the grade summaries equal to the raw rows through
+    creates, updates, reviewer changes and deletes
+    """
+
+    def setUp(self):
+        seed(0, 2)
+        self.student = Student.objects.get(github="student0")
+        self.assignment = Assignment.objects.get(content__name="Content 1")
+        self.faculty = Faculty.objects.get(github="faculty0")
+        self.other = Faculty.objects.get(github="faculty1")
+
+    def assertNoDrift(self):
+        """
+        Every stored summary matches the raw rows
+        """
+        for summary in GRADE_SUMMARIES:
+            self.assertEqual(summary.drift(), [], summary.__name__)
+
+    def test_rebuild_sums_exactly(self):
+        """
+        Sums of many two-decimal grades compare equal after a rebuild
+        """
+        StudentAssignment.objects.bulk_create(
+            StudentAssignment(
+                student=self.student,
+                assignment=self.assignment,
+                submitted=timezone.now(),
+                grade=Decimal("123.45"),
+                reviewer=self.faculty,
+            )
+            for _ in range(164)
+        )
+        for summary in GRADE_SUMMARIES:
+            summary.rebuild()
+        self.assertNoDrift()
+        self.assertEqual(
+            self.student.grade_summary.grade_total,
+            Decimal("123.45") * 164
+            + StudentAssignment.objects.get(
+                student=self.student, assignment__content__name="Content 0"
+            ).grade,
+        )
+
+    def test_create_update_delete(self):
+        """
+        Submitting, grading and deleting a row moves its summaries
+        """
+        row = StudentAssignment.objects.create(
+            student=self.student, assignment=self.assignment
+        )
+        self.assertNoDrift()
+        row.submitted = timezone.now()
+        row.save()
+        self.assertNoDrift()
+        row.grade, row.reviewer = Decimal("123.45"), self.faculty
+        row.save()
+        self.assertNoDrift()
+        summary = self.assignment.grade_summary
+        summary.refresh_from_db()
+        self.assertEqual(
+            (summary.num_submitted, summary.num_graded, summary.grade_total),
+            (1, 1, Decimal("123.45")),
+        )
+        row.delete()
+        self.assertNoDrift()
+        summary.refresh_from_db()
+        self.assertEqual(
+            (summary.num_submitted, summary.num_graded, summary.grade_total),
+            (0, 0, 0),
+        )
+
+    def test_reviewer_change(self):
+        """
+        A regrade by another faculty moves the grade between their summaries
+        """
+        row = StudentAssignment.objects.create(
+            student=self.student,
+            assignment=self.assignment,
+            submitted=timezone.now(),
+            grade=Decimal("50"),
+            reviewer=self.other,
+        )
+        before = FacultyGradeSummary.objects.get(faculty=self.faculty).num_graded
+        row.reviewer = self.faculty
+        row.save()
+        self.assertNoDrift()
+        self.assertEqual(
+            FacultyGradeSummary.objects.get(faculty=self.other).num_graded, 0
+        )
+        self.assertEqual(
+            FacultyGradeSummary.objects.get(faculty=self.faculty).num_graded,
+            before + 1,
+        )
+
+    def test_apply_many_missing(self):
+        """
+        apply_many rebuilds summaries that do not exist yet from the raw rows
+        """
+        StudentGradeSummary.objects.filter(student=self.student).delete()
+        StudentGradeSummary.apply_many({self.student.pk: {"num_submitted": 1}})
+        self.assertTrue(
+            StudentGradeSummary.objects.filter(student=self.student).exists()
+        )
+        self.assertNoDrift()
+
+
+class UpdateFromValuesTest(TestCase):
+    """
+    update_from_values writes every column type it is used with on the
+    configured database, not only the one it was written against
+    """
+
+    def setUp(self):
+        seed(0, 4)
+        self.rows = list(StudentAssignment.objects.order_by("id"))
+
+    def test_types(self):
+        """
+        Decimals, datetimes, text and None land as the column types
+        """
+        when = timezone.now().replace(microsecond=0) - datetime.timedelta(days=3)
+        faculty = Faculty.objects.get(github="faculty3")
+        updated = update_from_values(
+            StudentAssignment,
+            "id",
+            ["grade", "reviewed", "reviewer", "feedback"],
+            [
+                (self.rows[0].pk, Decimal("12.34"), when, faculty.pk, "Good"),
+                (self.rows[1].pk, None, None, None, ""),
+            ],
+        )
+        self.assertEqual(updated, 2)
+        first = StudentAssignment.objects.get(pk=self.rows[0].pk)
+        self.assertEqual(
+            (first.grade, first.reviewed, first.reviewer, first.feedback),
+            (Decimal("12.34"), when, faculty, "Good"),
+        )
+        second = StudentAssignment.objects.get(pk=self.rows[1].pk)
+        self.assertEqual(
+            (second.grade, second.reviewed, second.reviewer, second.feedback),
+            (None, None, None, ""),
+        )
+        self.assertEqual(
+            StudentAssignment.objects.get(pk=self.rows[2].pk).grade,
+            self.rows[2].grade,
+        )
+
+    def test_add_by_foreign_key(self):
+        """
+        Fields in add are incremented on rows matched by a foreign key
+        """
+        student = self.rows[0].student
+        before = StudentGradeSummary.objects.get(student=student)
+        update_from_values(
+            StudentGradeSummary,
+            "student",
+            ["num_graded", "grade_total"],
+            [(student.pk, 2, Decimal("0.05"))],
+            add=["num_graded", "grade_total"],
+        )
+        after = StudentGradeSummary.objects.get(student=student)
+        self.assertEqual(after.num_graded, before.num_graded + 2)
+        self.assertEqual(after.grade_total, before.grade_total + Decimal("0.05"))
+
+
+class BulkGradeTest(TestCase):
+    """
+    The bulk grading endpoint grades checked rows all or nothing and keeps
+    the summaries, grading queue and progress timelines in step
+    """
+
+    url = "/api/voyage/grades/bulk/"
+
+    def setUp(self):
+        seed(0, 8)
+        self.faculty = Faculty.objects.get(github="faculty2")
+        self.other = Faculty.objects.get(github="faculty6")
+        self.client.force_login(self.faculty.user)
+        # Submitted and waiting, unsubmitted, already graded
+        self.waiting = [
+            StudentAssignment.objects.get(student__github=f"student{i}") for i in (2, 6)
+        ]
+        self.unsubmitted = StudentAssignment.objects.get(student__github="student1")
+        self.graded = StudentAssignment.objects.get(student__github="student4")
+
+    def post(self, rows):
+        """
+        Response to posting rows as self.faculty
+        """
+        return self.client.post(self.url, rows, content_type="application/json")
+
+    def assertConsistent(self):
+        """
+        Summaries, queue and timelines all match the raw rows
+        """
+        for summary in GRADE_SUMMARIES:
+            self.assertEqual(summary.drift(), [], summary.__name__)
+        self.assertEqual(
+            set(GradingQueueItem.objects.values_list("student_assignment", flat=True)),
+            {pk for pk, *_ in GradingQueueItem.waiting()},
+        )
+        self.assertEqual(
+            {
+                (entry.student_assignment_id, entry.grade, entry.reviewed)
+                for entry in StudentProgress.objects.all()
+            },
+            set(StudentAssignment.objects.values_list("id", "grade", "reviewed")),
+        )
+
+    def test_success(self):
+        """
+        Rows are graded by the faculty, feedback kept where none was sent
+        """
+        StudentAssignment.objects.filter(pk=self.graded.pk).update(feedback="Kept")
+        response = self.post(
+            [
+                {
+                    "student_assignment_id": self.waiting[0].pk,
+                    "grade": "81.50",
+                    "feedback": "Good",
+                },
+                {"student_assignment_id": self.waiting[1].pk, "grade": "70"},
+                {"student_assignment_id": self.graded.pk, "grade": "99.99"},
+            ]
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json(), {"updated": 3})
+        pks = [self.waiting[0].pk, self.waiting[1].pk, self.graded.pk]
+        rows = StudentAssignment.objects.in_bulk(pks)
+        self.assertEqual(
+            [
+                (row.grade, row.feedback, row.reviewer_id, row.reviewed is None)
+                for row in map(rows.get, pks)
+            ],
+            [
+                (Decimal("81.50"), "Good", self.faculty.pk, False),
+                (Decimal("70"), None, self.faculty.pk, False),
+                (Decimal("99.99"), "Kept", self.faculty.pk, False),
+            ],
+        )
+        self.assertFalse(
+            GradingQueueItem.objects.filter(
+                student_assignment__in=self.waiting
+            ).exists()
+        )
+        self.assertConsistent()
+
+    def test_row_errors(self):
+        """
+        Unknown, unsubmitted and duplicate rows are reported by index and
+        nothing is written
+        """
+        response = self.post(
+            [
+                {"student_assignment_id": self.waiting[0].pk, "grade": "50"},
+                {"student_assignment_id": 10**9, "grade": "50"},
+                {"student_assignment_id": self.unsubmitted.pk, "grade": "50"},
+                {"student_assignment_id": self.waiting[0].pk, "grade": "60"},
+            ]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"],
+            [
+                {"index": 3, "detail": "Duplicate student_assignment_id"},
+                {"index": 1, "detail": "StudentAssignment does not exist"},
+                {
+                    "index": 2,
+                    "detail": "StudentAssignment has not been submitted",
+                },
+            ],
+        )
+        self.assertIsNone(StudentAssignment.objects.get(pk=self.waiting[0].pk).grade)
+        self.assertConsistent()
+
+    def test_claimed_by_other(self):
+        """
+        A row whose queue item another faculty holds is refused, an
+        expired claim is not
+        """
+        now = timezone.now()
+        GradingQueueItem.objects.filter(student_assignment=self.waiting[0]).update(
+            claimed_by=self.other, claimed_at=now
+        )
+        GradingQueueItem.objects.filter(student_assignment=self.waiting[1]).update(
+            claimed_by=self.other, claimed_at=now - datetime.timedelta(days=1)
+        )
+        rows = [
+            {"student_assignment_id": self.waiting[0].pk, "grade": "50"},
+            {"student_assignment_id": self.waiting[1].pk, "grade": "50"},
+        ]
+        response = self.post(rows)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"],
+            [{"index": 0, "detail": "StudentAssignment is claimed by another faculty"}],
+        )
+        response = self.post(rows[1:])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertConsistent()
+
+    def test_claimed_after_check(self):
+        """
+        A claim taken between the check and the write stops apply_grades
+        before anything is written
+        """
+        GradingQueueItem.objects.filter(student_assignment=self.waiting[1]).update(
+            claimed_by=self.other, claimed_at=timezone.now()
+        )
+        rows = [
+            {"student_assignment_id": pk, "grade": Decimal("50")}
+            for pk in (self.graded.pk, self.waiting[0].pk, self.waiting[1].pk)
+        ]
+        with self.assertRaises(ClaimedError) as raised:
+            apply_grades(rows, self.faculty, chunk_size=2)
+        self.assertEqual(raised.exception.ids, {self.waiting[1].pk})
+        self.assertEqual(
+            StudentAssignment.objects.get(pk=self.waiting[0].pk).grade, None
+        )
+        self.assertEqual(
+            StudentAssignment.objects.get(pk=self.graded.pk).grade, self.graded.grade
+        )
+        self.assertConsistent()
+
+
+class OnboardingTest(TestCase):
+    """
+    A CSV import reports the rows the User fields reject and imports the
+    rest
+    """
+
+    def setUp(self):
+        seed(0, 1)
+        self.program = Program.objects.get()
+
+    def test_invalid_rows_skipped(self):
+        """
+        Bad usernames and emails among good rows fail alone
+        """
+        rows = [
+            ("new0", "new0@example.com", "new0"),
+            ("x" * 151, "", "long"),
+            ("new1", "not an email", "new1"),
+            ("bad name", "", "bad"),
+            ("new2", f"{'x' * 250}@example.com", "new2"),
+            ("new3", "", "new3"),
+        ]
+        lines = ["username,email,github,program"] + [
+            f"{username},{email},{github},{self.program.pk}"
+            for username, email, github in rows
+        ]
+        created, errors = import_students(lines, processes=1)
+        self.assertEqual(created, 2)
+        self.assertEqual([line for line, _ in errors], [3, 4, 5, 6])
+        self.assertTrue(errors[0][1].startswith("Invalid username"))
+        self.assertTrue(errors[1][1].startswith("Invalid email"))
+        self.assertEqual(
+            set(Student.objects.values_list("github", flat=True)),
+            {"student0", "new0", "new3"},
+        )
+
+
+class LockNameTest(SimpleTestCase):
+    """
+    Report locks have short keys, equal for equal id sets
+    """
+
+    def test_fixed_length(self):
+        """
+        A chunk of large ids fits a memcached key, in any order
+        """
+        ids = list(range(10**9, 10**9 + 1000))
+        name = lock_name("grades", ids)
+        self.assertEqual(name, lock_name("grades", reversed(ids)))
+        self.assertNotEqual(name, lock_name("grades", ids[1:]))
+        self.assertNotEqual(name, lock_name("backlog", ids))
+        self.assertLess(len(name), 100)
+
+
+@override_settings(GRADING_CLAIM_TIMEOUT=60)
+class GradingQueueTest(TestCase):
+    """
+    Claims hand each queued submission to one faculty until they lapse
+    """
+
+    url = "/api/voyage/grading/queue/"
+
+    def setUp(self):
+        seed(0, 12)
+        self.faculty = Faculty.objects.get(github="faculty0")
+        self.other = Faculty.objects.get(github="faculty10")
+        # Submissions 6 and 2 queue for faculty, 6 due first; 10 for other
+        Content.objects.exclude(name="Content 10").update(faculty=self.faculty)
+        GradingQueueItem.rebuild()
+        self.rows = {
+            i: StudentAssignment.objects.get(student__github=f"student{i}")
+            for i in (2, 6, 10)
+        }
+
+    def claim_as(self, i, faculty, seconds_ago=0):
+        """
+        Claims the queue item of row i for faculty seconds_ago
+        """
+        GradingQueueItem.objects.filter(student_assignment=self.rows[i]).update(
+            claimed_by=faculty,
+            claimed_at=timezone.now() - datetime.timedelta(seconds=seconds_ago),
+        )
+
+    def claimed_by(self, i):
+        """
+        Faculty id holding the claim on row i
+        """
+        return GradingQueueItem.objects.get(
+            student_assignment=self.rows[i]
+        ).claimed_by_id
+
+    def test_priority_order(self):
+        """
+        Claims come earliest due first and are not handed out twice
+        """
+        self.assertEqual(
+            list(GradingQueueItem.claim(self.faculty, 5)),
+            [self.rows[6], self.rows[2]],
+        )
+        self.assertEqual(list(GradingQueueItem.claim(self.faculty, 5)), [])
+        self.assertEqual(self.claimed_by(10), None)
+
+    def test_cutoff(self):
+        """
+        Of two claims by another faculty the lapsed one is taken over, the
+        live one is left alone
+        """
+        self.claim_as(6, self.other, seconds_ago=120)
+        self.claim_as(2, self.other, seconds_ago=30)
+        self.assertEqual(list(GradingQueueItem.claim(self.faculty, 5)), [self.rows[6]])
+        self.assertEqual(self.claimed_by(6), self.faculty.pk)
+        self.assertEqual(self.claimed_by(2), self.other.pk)
+
+    def test_paths(self):
+        """
+        Claims are the same with and without skip_locked support
+        """
+        for locking in (True, False):
+            with self.subTest(locking=locking):
+                GradingQueueItem.objects.update(claimed_by=None, claimed_at=None)
+                self.claim_as(6, self.other)
+                with mock.patch.object(
+                    connection.features, "has_select_for_update_skip_locked", locking
+                ):
+                    claimed = list(GradingQueueItem.claim(self.faculty, 5))
+                self.assertEqual(claimed, [self.rows[2]])
+
+    def test_lost_race(self):
+        """
+        Without skip_locked, an item claimed between the read and the
+        conditional UPDATE is left to the winner and the next one taken
+        """
+        won = []
+
+        def concurrent_claim(execute, sql, params, many, context):
+            if not won and sql.startswith('UPDATE "voyage_gradingqueueitem"'):
+                won.append(sql)
+                self.claim_as(6, self.other)
+            return execute(sql, params, many, context)
+
+        with mock.patch.object(
+            connection.features, "has_select_for_update_skip_locked", False
+        ):
+            with connection.execute_wrapper(concurrent_claim):
+                claimed = list(GradingQueueItem.claim(self.faculty, 1))
+        self.assertEqual(claimed, [self.rows[2]])
+        self.assertEqual(self.claimed_by(6), self.other.pk)
+
+    def test_view(self):
+        """
+        Faculty list their own queue and claim from it until it is empty
+        """
+        self.client.force_login(self.faculty.user)
+        response = self.client.get(self.url)
+        self.assertEqual(
+            [item["student_assignment"] for item in response.json()["results"]],
+            [self.rows[6].pk, self.rows[2].pk],
+        )
+        self.claim_as(6, self.other)
+        response = self.client.post(self.url, {"count": 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.json()], [self.rows[2].pk])
+        response = self.client.post(self.url, {"count": 5})
+        self.assertEqual(response.status_code, 204)
+
+
+class StudentProgressTest(TestCase):
+    """
+    Progress timelines classify each row and stay current through saves,
+    bulk grading and repo syncs
+    """
+
+    def setUp(self):
+        seed(0, 2)
+        self.now = timezone.now().replace(microsecond=0)
+        self.student = Student.objects.get(github="student0")
+        self.faculty = Faculty.objects.get(github="faculty0")
+        seeded = Assignment.objects.get(content__name="Content 0")
+        # Besides the seeded row, submitted and graded at its due date
+        self.rows = {}
+        for name, due, submitted in (
+            ("late", -3 * 24, -24),
+            ("missing", -2 * 24, None),
+            ("early", 24, -1),
+            ("pending", 2 * 24, None),
+        ):
+            content = Content.objects.create(
+                name=f"Work {name}",
+                faculty=self.faculty,
+                repo=f"https://github.com/voyage/work-{name}",
+            )
+            assignment = Assignment.objects.create(
+                program=seeded.program,
+                course=seeded.course,
+                content=content,
+                due=self.now + datetime.timedelta(hours=due),
+                instructions="",
+                rubric="",
+            )
+            self.rows[name] = StudentAssignment.objects.create(
+                student=self.student,
+                assignment=assignment,
+                submitted=(
+                    None
+                    if submitted is None
+                    else self.now + datetime.timedelta(hours=submitted)
+                ),
+            )
+
+    def progress(self, user=None):
+        """
+        Counts and statuses in timeline order of self.student, read as
+        user, faculty by default
+        """
+        self.client.force_login(user or self.faculty.user)
+        response = self.client.get(f"/api/voyage/progress/{self.student.pk}/")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        return body["counts"], [entry["status"] for entry in body["timeline"]]
+
+    def test_status(self):
+        """
+        Submitted at the due date is on time, unsubmitted at it pending
+        """
+        entry = StudentProgress(due=self.now, submitted=self.now)
+        self.assertEqual(entry.status(), StudentProgress.ON_TIME)
+        entry.submitted = None
+        self.assertEqual(entry.status(self.now), StudentProgress.PENDING)
+        self.assertEqual(
+            entry.status(self.now + datetime.timedelta(seconds=1)),
+            StudentProgress.MISSING,
+        )
+
+    def test_timeline(self):
+        """
+        Rows are classified in due date order and counted per status
+        """
+        counts, statuses = self.progress()
+        self.assertEqual(
+            counts,
+            {"on_time": 2, "late": 1, "missing": 1, "pending": 1, "graded": 1},
+        )
+        self.assertEqual(statuses, ["late", "missing", "on_time", "on_time", "pending"])
+
+    def test_access(self):
+        """
+        Students read their own timeline only
+        """
+        self.client.force_login(self.student.user)
+        response = self.client.get("/api/voyage/progress/")
+        self.assertEqual(response.json()["student"], self.student.pk)
+        other = Student.objects.get(github="student1")
+        self.client.force_login(other.user)
+        response = self.client.get(f"/api/voyage/progress/{self.student.pk}/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_bulk_grading(self):
+        """
+        Grades applied in bulk show on the timeline
+        """
+        apply_grades(
+            [
+                {"student_assignment_id": self.rows["late"].pk, "grade": 75},
+                {"student_assignment_id": self.rows["early"].pk, "grade": 90},
+            ],
+            self.faculty,
+        )
+        counts, _ = self.progress()
+        self.assertEqual(counts["graded"], 3)
+        self.assertEqual(
+            StudentProgress.objects.get(student_assignment=self.rows["late"]).grade,
+            75,
+        )
+
+    def test_repo_sync(self):
+        """
+        Submissions found by a repo sync move rows from missing to late and
+        from pending to on time
+        """
+        repo = StudentCourseRepo.objects.get(student=self.student)
+        StudentCourseRepo.objects.exclude(id=repo.id).delete()
+        backend = FakeBackend(
+            {
+                repo.repo: (
+                    "v1",
+                    {"work-missing": self.now, "work-pending": self.now},
+                )
+            }
+        )
+        self.assertEqual(sync_repos(backend=backend), (1, 2))
+        counts, statuses = self.progress()
+        self.assertEqual(
+            counts,
+            {"on_time": 3, "late": 2, "missing": 0, "pending": 0, "graded": 1},
+        )
+        self.assertEqual(statuses, ["late", "late", "on_time", "on_time", "on_time"])
@@ -0,0 +1,36 @@
+"""
+Api Urls
+"""
+
+from django.urls import path
+from rest_framework.routers import DefaultRouter
+from ..views.apiviews import (
+    BulkGradeView,
+    GradingQueueView,
+    StudentProgressView,
+    ReportView,
+    ProgramViewSet,
+    CourseViewSet,
+    StudentViewSet,
+    AssignmentViewSet,
+    StudentAssignmentViewSet,
+)
+
+router = DefaultRouter()
+router.register("programs", ProgramViewSet)
+router.register("courses", CourseViewSet)
+router.register("students", StudentViewSet)
+router.register("assignments", AssignmentViewSet)
+router.register("studentassignments", StudentAssignmentViewSet)
+
+urlpatterns = [
+    path("grades/bulk/", BulkGradeView.as_view(), name="api_bulk_grade"),
+    path("grading/queue/", GradingQueueView.as_view(), name="api_grading_queue"),
+    path("progress/", StudentProgressView.as_view(), name="api_progress"),
+    path(
+        "progress/<int:student_id>/",
+        StudentProgressView.as_view(),
+        name="api_student_progress",
+    ),
+    path("reports/<str:name>/<int:pk>/", ReportView.as_view(), name="api_report"),
+] + router.urls
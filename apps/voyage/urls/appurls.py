@@ -15,7 +15,9 @@ from ..views.appviews import (
     StudentDetailView,
     StudentsAssignments,
     SubmissionsView,
-    CreateNewCourse
+    CreateNewCourse,
+    GradebookExportView,
+    GradeStatisticsView,
 )
 
 urlpatterns = [
@@ -37,4 +39,6 @@ urlpatterns = [
     path("submissions/", SubmissionsView.as_view(), name="submissions"),
     path("course/new/", CreateNewCourse.as_view(), name="new_course"),
     path("assignment/new/", CreateNewAssignment.as_view(), name="new_assignment"),
+    path("gradebook/", GradebookExportView.as_view(), name="gradebook_export"),
+    path("statistics/", GradeStatisticsView.as_view(), name="grade_statistics"),
 ]
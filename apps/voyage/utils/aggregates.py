@@ -0,0 +1,31 @@
+"""
+aggregates.py
+"""
+
+from django.db.models import Count, OuterRef, Subquery
+
+
+def subquery_aggregate(queryset, field, aggregate, outer="pk"):
+    """
+    Correlated subquery returning `aggregate` over the rows of `queryset`
+    whose `field` matches `outer` on the outer query.
+
+    Annotating several reverse relations with plain joins multiplies rows,
+    one subquery per column keeps every aggregate independent.
+    """
+    return Subquery(
+        queryset.filter(**{field: OuterRef(outer)})
+        .order_by()
+        .values(field)
+        .annotate(value=aggregate)
+        .values("value")
+    )
+
+
+def subquery_count(queryset, field, outer="pk", count="id", distinct=False):
+    """
+    Number of rows, or of distinct count values, of queryset per outer row
+    """
+    return subquery_aggregate(
+        queryset, field, Count(count, distinct=distinct), outer=outer
+    )
@@ -0,0 +1,99 @@
+"""
+batch.py
+"""
+
+from itertools import islice
+
+from django.db import connections, router, transaction
+
+
+def chunked(iterable, size):
+    """
+    Yields lists of at most size items without materialising iterable
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def bulk_insert(model, objs, size=1000):
+    """
+    bulk_create objs in chunks of size, one transaction per chunk
+    """
+    count = 0
+    for chunk in chunked(objs, size):
+        with transaction.atomic():
+            model.objects.bulk_create(chunk, batch_size=size)
+        count += len(chunk)
+    return count
+
+
+def update_from_values(model, key, fields, rows, add=()):
+    """
+    Sets fields on the rows of model matching key, from rows of
+    (key, *values), in one UPDATE joined to the rows as a derived table.
+    Fields named in add are incremented by their value instead.
+
+    bulk_update builds a CASE with a WHEN per row and field, which costs
+    more to compile than to run. Here every row is just its parameters.
+    SQLite needs 3.33 or later for UPDATE ... FROM.
+    """
+    if not rows:
+        return 0
+    connection = connections[router.db_for_write(model)]
+    fields = [model._meta.get_field(name) for name in (key, *fields)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = [quote(field.column) for field in fields]
+    # Grades and timestamps repeat across rows, each value is prepared once
+    prepared = {}
+    params = []
+    # In key order the joined rows are found in order of the table's pages
+    for row in sorted(rows, key=lambda row: row[0]):
+        for i, value in enumerate(row):
+            if (i, value) not in prepared:
+                prepared[i, value] = fields[i].get_db_prep_save(value, connection)
+            params.append(prepared[i, value])
+    placeholders = ", ".join(["%s"] * len(fields))
+    if connection.vendor == "mysql":
+        # MySQL has no UPDATE ... FROM, it joins a UNION of SELECTs and
+        # qualifies the columns it sets
+        first = ", ".join(f"%s AS {column}" for column in columns)
+        values = " UNION ALL ".join(
+            [f"SELECT {first}"] + [f"SELECT {placeholders}"] * (len(rows) - 1)
+        )
+        sources = [f"v.{column}" for column in columns]
+        targets = [f"{table}.{column}" for column in columns]
+        sql = (
+            f"UPDATE {table} JOIN ({values}) AS v "
+            f"ON {table}.{columns[0]} = {sources[0]} SET {{}}"
+        )
+    else:
+        # VALUES columns are named column1, column2, ... on SQLite and PostgreSQL
+        values = ", ".join([f"({placeholders})"] * len(rows))
+        sources = [f"v.column{i}" for i in range(1, len(columns) + 1)]
+        targets = columns
+        if connection.vendor == "postgresql":
+            # Untyped VALUES columns come out as text, cast them to the
+            # column types. SQLite would give datetimes numeric affinity.
+            sources = [
+                f"CAST({source} AS {field.cast_db_type(connection)})"
+                for field, source in zip(fields, sources)
+            ]
+        sql = (
+            f"UPDATE {table} SET {{}} FROM (VALUES {values}) AS v "
+            f"WHERE {table}.{columns[0]} = {sources[0]}"
+        )
+    assignments = ", ".join(
+        (
+            f"{target} = {table}.{column} + {source}"
+            if field.name in add
+            else f"{target} = {source}"
+        )
+        for field, column, target, source in zip(
+            fields[1:], columns[1:], targets[1:], sources[1:]
+        )
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(assignments), params)
+        return cursor.rowcount
@@ -0,0 +1,78 @@
+"""
+cache.py
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+ROSTER_VERSION_KEY = "voyage:roster:version"
+PAGE_VERSION_KEY = "voyage:page:version"
+
+
+def version(key):
+    """
+    Current value of the version counter key
+    """
+    value = cache.get(key)
+    if value is None:
+        # Start from the clock so an evicted version never reuses old keys
+        cache.add(key, time.time_ns(), timeout=None)
+        value = cache.get(key)
+    return value
+
+
+def bump(key):
+    """
+    Moves the version counter key on, entries of the old version expire
+    unused
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def roster_version():
+    """
+    Current roster version, part of every roster cache key
+    """
+    return version(ROSTER_VERSION_KEY)
+
+
+def invalidate_rosters():
+    """
+    Moves every roster to a new version once the current transaction
+    commits, old entries expire unused
+    """
+    transaction.on_commit(lambda: bump(ROSTER_VERSION_KEY))
+
+
+def page_version():
+    """
+    Current page version, part of every page cache key
+    """
+    return version(PAGE_VERSION_KEY)
+
+
+def invalidate_pages():
+    """
+    Moves every cached page to a new version once the current transaction
+    commits, old entries expire unused. Bumped earlier, a page read before
+    the commit would be stored under the new version.
+    """
+    transaction.on_commit(lambda: bump(PAGE_VERSION_KEY))
+
+
+def cached_ids(name, queryset):
+    """
+    Ids of queryset, cached under name for the current roster version
+    """
+    key = f"voyage:roster:{roster_version()}:{name}"
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(queryset.values_list("id", flat=True))
+        cache.set(key, ids, getattr(settings, "ROSTER_CACHE_TIMEOUT", 3600))
+    return ids
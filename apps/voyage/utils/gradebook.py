@@ -0,0 +1,143 @@
+"""
+gradebook.py
+"""
+
+import csv
+import datetime
+
+from django.utils import timezone
+
+from ..models import StudentAssignment
+from .batch import chunked
+
+# (header, StudentAssignment lookup)
+GRADEBOOK_COLUMNS = (
+    ("id", "id"),
+    ("student", "student__user__username"),
+    ("github", "student__github"),
+    ("program", "assignment__program__name"),
+    ("course", "assignment__course__name"),
+    ("assignment", "assignment__content__name"),
+    ("due", "assignment__due"),
+    ("submitted", "submitted"),
+    ("reviewed", "reviewed"),
+    ("grade", "grade"),
+    ("reviewer", "reviewer__user__username"),
+)
+
+GRADEBOOK_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def gradebook_rows(program=None, course=None, start=None, end=None, chunk_size=2000):
+    """
+    Streams gradebook tuples, submitted between the dates start and end
+    inclusive, in GRADEBOOK_COLUMNS order
+    """
+    rows = StudentAssignment.objects.all()
+    if program:
+        rows = rows.filter(assignment__program=program)
+    if course:
+        rows = rows.filter(assignment__course=course)
+    if start:
+        rows = rows.filter(submitted__gte=day_start(start))
+    if end:
+        rows = rows.filter(submitted__lt=day_start(end + datetime.timedelta(days=1)))
+    return (
+        rows.order_by("id")
+        .values_list(*(lookup for _, lookup in GRADEBOOK_COLUMNS))
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def day_start(date):
+    """
+    Aware datetime at the start of date
+    """
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time()))
+
+
+class Echo:
+    """
+    File-like object returning what is written, for csv.writer
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    """
+    Gradebook rows as CSV lines
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in GRADEBOOK_COLUMNS])
+    for row in rows:
+        yield writer.writerow(row)
+
+
+class Sink:
+    """
+    Write-only file collecting bytes until drained
+    """
+
+    closed = False
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer.extend(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def iter_parquet(rows, chunk_size=2000):
+    """
+    Gradebook rows as Parquet bytes, one row group per chunk
+    """
+    # pylint: disable=import-outside-toplevel
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    timestamp = pa.timestamp("us", tz="UTC")
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("student", pa.string()),
+            ("github", pa.string()),
+            ("program", pa.string()),
+            ("course", pa.string()),
+            ("assignment", pa.string()),
+            ("due", timestamp),
+            ("submitted", timestamp),
+            ("reviewed", timestamp),
+            ("grade", pa.decimal128(5, 2)),
+            ("reviewer", pa.string()),
+        ]
+    )
+    sink = Sink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in chunked(rows, chunk_size):
+            writer.write_table(
+                pa.Table.from_pylist(
+                    [dict(zip(schema.names, row)) for row in chunk], schema=schema
+                )
+            )
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,156 @@
+"""
+grading.py
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import (
+    GradingQueueItem,
+    StudentAssignment,
+    StudentProgress,
+    StudentGradeSummary,
+    AssignmentGradeSummary,
+    FacultyGradeSummary,
+)
+from .batch import chunked, update_from_values
+from .cache import invalidate_pages
+
+SUMMARIES = (StudentGradeSummary, AssignmentGradeSummary, FacultyGradeSummary)
+
+
+CLAIMED = "StudentAssignment is claimed by another faculty"
+
+
+class ClaimedError(Exception):
+    """
+    Rows ids were claimed by another faculty after they were checked
+    """
+
+    def __init__(self, ids):
+        super().__init__(f"{len(ids)} rows claimed by another faculty")
+        self.ids = ids
+
+
+def claimed_elsewhere(ids, faculty, lock=False):
+    """
+    Those of the StudentAssignment ids whose queue item holds an unexpired
+    claim by a faculty other than faculty. With lock the queue items stay
+    locked until the transaction ends, so no claim can be taken meanwhile.
+    """
+    items = GradingQueueItem.objects.filter(student_assignment__in=ids)
+    if lock:
+        items = items.select_for_update()
+    cutoff = GradingQueueItem.claim_cutoff()
+    return {
+        pk
+        for pk, claimed_by, claimed_at in items.values_list(
+            "student_assignment_id", "claimed_by_id", "claimed_at"
+        )
+        if claimed_by not in (None, faculty.pk) and claimed_at >= cutoff
+    }
+
+
+def check_grades(rows, faculty, lookup_size=900):
+    """
+    Errors per row index for rows that faculty cannot grade, in one pass.
+
+    Rows are validated GradeSerializer data. Ids are looked up lookup_size
+    at a time to stay under the database parameter limits. Rows whose
+    queue item another faculty holds an unexpired claim on are refused.
+    """
+    errors = {}
+    seen = set()
+    for index, row in enumerate(rows):
+        if row["student_assignment_id"] in seen:
+            errors[index] = "Duplicate student_assignment_id"
+        seen.add(row["student_assignment_id"])
+    submitted = {}
+    claimed = set()
+    for ids in chunked(seen, lookup_size):
+        submitted.update(
+            StudentAssignment.objects.filter(id__in=ids).values_list("id", "submitted")
+        )
+        claimed |= claimed_elsewhere(ids, faculty)
+    for index, row in enumerate(rows):
+        if row["student_assignment_id"] not in submitted:
+            errors.setdefault(index, "StudentAssignment does not exist")
+        elif submitted[row["student_assignment_id"]] is None:
+            errors.setdefault(index, "StudentAssignment has not been submitted")
+        elif row["student_assignment_id"] in claimed:
+            errors.setdefault(index, CLAIMED)
+    return errors
+
+
+def apply_grades(rows, faculty, chunk_size=1000):
+    """
+    Grades checked rows as faculty in one transaction, chunk_size rows at
+    a time, moving the rows' contributions between grade summaries, taking
+    them off the grading queue and onto the progress timelines. Feedback is
+    only written for rows that carry it.
+
+    Claims are checked again on the locked rows, one taken by another
+    faculty since check_grades raises ClaimedError and nothing is written.
+    """
+    now = timezone.now()
+    count = 0
+    with transaction.atomic():
+        # Chunks of neighbouring ids touch neighbouring pages
+        ordered = sorted(rows, key=lambda row: row["student_assignment_id"])
+        for chunk in chunked(ordered, chunk_size):
+            grades = [(row["student_assignment_id"], row["grade"]) for row in chunk]
+            new_grades = dict(grades)
+            locked = StudentAssignment.objects.filter(id__in=new_grades)
+            list(locked.select_for_update().values_list("id"))
+            claimed = claimed_elsewhere(new_grades, faculty, lock=True)
+            if claimed:
+                raise ClaimedError(claimed)
+            # Summaries move by the totals of the chunk before and after,
+            # summed by the database rather than row by row here
+            before = {summary: summary.aggregate(locked) for summary in SUMMARIES}
+            # Each row is written once, joined to its grade and the values
+            # shared by the chunk; rows sent without feedback keep theirs
+            fields = ["grade", "reviewed", "reviewer", "dtm_updated"]
+            shared = (now, faculty.pk, now)
+            update_from_values(
+                StudentAssignment,
+                "id",
+                fields,
+                [
+                    (row["student_assignment_id"], row["grade"], *shared)
+                    for row in chunk
+                    if "feedback" not in row
+                ],
+            )
+            update_from_values(
+                StudentAssignment,
+                "id",
+                [*fields, "feedback"],
+                [
+                    (
+                        row["student_assignment_id"],
+                        row["grade"],
+                        *shared,
+                        row["feedback"],
+                    )
+                    for row in chunk
+                    if "feedback" in row
+                ],
+            )
+            # Updates send no signals, the summaries, queue and timelines
+            # follow here
+            for summary in SUMMARIES:
+                summary.apply_many(
+                    summary.difference(before[summary], summary.aggregate(locked))
+                )
+            GradingQueueItem.objects.filter(student_assignment__in=new_grades).delete()
+            update_from_values(
+                StudentProgress,
+                "student_assignment",
+                ["grade", "reviewed", "dtm_updated"],
+                [(pk, grade, now, now) for pk, grade in grades],
+            )
+            count += len(chunk)
+        # Updates send no signals
+        invalidate_pages()
+    return count
@@ -0,0 +1,184 @@
+"""
+onboarding.py
+"""
+
+import csv
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import DataError, IntegrityError, transaction
+
+from ..models import Program, Student
+from .batch import chunked
+from .cache import invalidate_pages, invalidate_rosters
+
+STUDENT_COLUMNS = ("username", "email", "github", "program", "password")
+REQUIRED_COLUMNS = ("username", "github", "program")
+
+# GitHub handles: alphanumerics and single inner hyphens, at most 39 long
+GITHUB_HANDLE = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9]|-(?=[A-Za-z0-9])){0,38}$")
+
+
+def import_students(lines, chunk_size=500, processes=None):
+    """
+    Creates a user and a student per row of CSV lines, chunk_size rows at
+    a time. Bad rows are reported and skipped, the rest still import.
+    Returns (created, [(line, error), ...]).
+
+    Passwords are hashed in a pool of processes workers, a single process
+    hashes in place. Rows without a password get an unusable one.
+    """
+    reader = csv.DictReader(lines)
+    missing = [i for i in REQUIRED_COLUMNS if i not in (reader.fieldnames or ())]
+    if missing:
+        return 0, [(1, f"Missing columns: {', '.join(missing)}")]
+
+    seen = {"username": set(), "github": set()}
+    created, errors = 0, []
+    if processes == 1:
+        pool, hasher = nullcontext(), map
+    else:
+        pool = ProcessPoolExecutor(processes, initializer=django.setup)
+        hasher = pool.map
+    with pool:
+        for chunk in chunked(enumerate(reader, start=2), chunk_size):
+            rows = check_students(chunk, seen, errors)
+            created += create_students(rows, hasher, errors)
+    if created:
+        # bulk_create sends no signals
+        invalidate_rosters()
+        invalidate_pages()
+    errors.sort()
+    return created, errors
+
+
+def check_students(chunk, seen, errors):
+    """
+    Rows of chunk, [(line, row), ...], that can be created. Handles and
+    usernames are checked against the database in one lookup each, and
+    against earlier rows through seen.
+    """
+    rows = []
+    for line, row in chunk:
+        row = {i: (row.get(i) or "").strip() for i in STUDENT_COLUMNS}
+        error = None
+        if not all(row[i] for i in REQUIRED_COLUMNS):
+            error = f"Required: {', '.join(REQUIRED_COLUMNS)}"
+        elif user_error := check_user_fields(row):
+            error = user_error
+        elif not GITHUB_HANDLE.match(row["github"]):
+            error = f"Invalid github handle {row['github']}"
+        elif not row["program"].isdigit():
+            error = f"Invalid program {row['program']}"
+        elif row["github"] in seen["github"]:
+            error = f"Duplicate github {row['github']}"
+        elif row["username"] in seen["username"]:
+            error = f"Duplicate username {row['username']}"
+        if error:
+            errors.append((line, error))
+            continue
+        seen["github"].add(row["github"])
+        seen["username"].add(row["username"])
+        rows.append((line, row))
+
+    taken_github = set(
+        Student.objects.filter(
+            github__in=[row["github"] for _, row in rows]
+        ).values_list("github", flat=True)
+    )
+    taken_username = set(
+        get_user_model()
+        .objects.filter(username__in=[row["username"] for _, row in rows])
+        .values_list("username", flat=True)
+    )
+    programs = set(
+        Program.objects.filter(
+            id__in={int(row["program"]) for _, row in rows}
+        ).values_list("id", flat=True)
+    )
+    valid = []
+    for line, row in rows:
+        if row["github"] in taken_github:
+            errors.append((line, f"github {row['github']} already exists"))
+        elif row["username"] in taken_username:
+            errors.append((line, f"username {row['username']} already exists"))
+        elif int(row["program"]) not in programs:
+            errors.append((line, f"Program {row['program']} does not exist"))
+        else:
+            valid.append((line, row))
+    return valid
+
+
+def check_user_fields(row):
+    """
+    Error of the first of username and email of row that the User field
+    rejects, its validators and max_length, or None
+    """
+    user_model = get_user_model()
+    for name in ("username", "email"):
+        try:
+            user_model._meta.get_field(name).clean(row[name], None)
+        except ValidationError as exc:
+            return f"Invalid {name} {row[name]}: {' '.join(exc.messages)}"
+    return None
+
+
+def create_students(rows, hasher, errors):
+    """
+    bulk_create the users and students of checked rows in one transaction.
+    A row taken concurrently fails the bulk insert, the rows are then
+    retried one by one so only the conflicting ones are reported. Values
+    the database refuses, a DataError, are reported the same way.
+    """
+    if not rows:
+        return 0
+    passwords = list(
+        hasher(make_password, [row["password"] or None for _, row in rows])
+    )
+    try:
+        with transaction.atomic():
+            return bulk_create_students([row for _, row in rows], passwords)
+    except (DataError, IntegrityError):
+        pass
+    created = 0
+    for (line, row), password in zip(rows, passwords):
+        try:
+            with transaction.atomic():
+                created += bulk_create_students([row], [password])
+        except (DataError, IntegrityError) as exc:
+            errors.append((line, str(exc)))
+    return created
+
+
+def bulk_create_students(rows, passwords):
+    """
+    Users, then students linked to them by username
+    """
+    user_model = get_user_model()
+    user_model.objects.bulk_create(
+        [
+            user_model(username=row["username"], email=row["email"], password=password)
+            for row, password in zip(rows, passwords)
+        ]
+    )
+    users = dict(
+        user_model.objects.filter(
+            username__in=[row["username"] for row in rows]
+        ).values_list("username", "id")
+    )
+    Student.objects.bulk_create(
+        [
+            Student(
+                user_id=users[row["username"]],
+                github=row["github"],
+                program_id=int(row["program"]),
+            )
+            for row in rows
+        ]
+    )
+    return len(rows)
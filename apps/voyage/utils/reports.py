@@ -0,0 +1,146 @@
+"""
+reports.py
+"""
+
+import datetime
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import Floor, TruncDate
+from django.utils import timezone
+
+from ..models import StudentAssignment
+from .gradebook import day_start
+
+REPORT_KEY = "voyage:report:{name}:{pk}"
+LOCK_KEY = "voyage:lock:{name}"
+
+# Width of a grade distribution bucket, grades run from 0 to 999.99
+BUCKET_WIDTH = 100
+
+
+def report_key(name, pk):
+    """
+    Cache key of one precomputed report
+    """
+    return REPORT_KEY.format(name=name, pk=pk)
+
+
+def store_reports(name, reports):
+    """
+    Caches {pk: data} under name, stamped with the time of computation
+    """
+    computed = timezone.now().isoformat()
+    cache.set_many(
+        {
+            report_key(name, pk): {"computed": computed, "data": data}
+            for pk, data in reports.items()
+        },
+        getattr(settings, "REPORT_CACHE_TIMEOUT", None),
+    )
+    return len(reports)
+
+
+def cached_report(name, pk):
+    """
+    Precomputed report, None until a task has stored it
+    """
+    return cache.get(report_key(name, pk))
+
+
+@contextmanager
+def run_once(name, timeout=None):
+    """
+    Yields True to the only holder of the lock name, False to anyone
+    racing it. Expires after timeout so a killed worker cannot wedge it.
+    """
+    key = LOCK_KEY.format(name=name)
+    acquired = cache.add(
+        key, 1, timeout or getattr(settings, "REPORT_LOCK_TIMEOUT", 600)
+    )
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(key)
+
+
+def grade_distributions(course_ids):
+    """
+    {course id: stats and histogram} of the graded rows of course_ids
+    """
+    rows = (
+        StudentAssignment.objects.filter(
+            assignment__course_id__in=course_ids, grade__isnull=False
+        )
+        .annotate(bucket=Floor(F("grade") / BUCKET_WIDTH))
+        .order_by()
+        .values_list("assignment__course_id", "bucket")
+        .annotate(
+            count=Count("id"),
+            total=Sum("grade"),
+            low=Min("grade"),
+            high=Max("grade"),
+        )
+    )
+    reports = {
+        pk: {"count": 0, "avg": None, "min": None, "max": None, "histogram": {}}
+        for pk in course_ids
+    }
+    totals = dict.fromkeys(course_ids, 0)
+    for course_id, bucket, count, total, low, high in rows:
+        report = reports[course_id]
+        report["count"] += count
+        report["min"] = low if report["min"] is None else min(report["min"], low)
+        report["max"] = high if report["max"] is None else max(report["max"], high)
+        report["histogram"][int(bucket) * BUCKET_WIDTH] = count
+        totals[course_id] += total
+    for pk, report in reports.items():
+        if report["count"]:
+            report["avg"] = round(totals[pk] / report["count"], 2)
+    return reports
+
+
+def grading_backlogs(faculty_ids):
+    """
+    {faculty id: submitted but ungraded rows of their content}
+    """
+    rows = (
+        StudentAssignment.objects.filter(
+            assignment__content__faculty_id__in=faculty_ids,
+            submitted__isnull=False,
+            grade__isnull=True,
+        )
+        .order_by()
+        .values_list("assignment__content__faculty_id")
+        .annotate(count=Count("id"), oldest=Min("submitted"))
+    )
+    reports = {pk: {"count": 0, "oldest": None} for pk in faculty_ids}
+    for faculty_id, count, oldest in rows:
+        reports[faculty_id] = {"count": count, "oldest": oldest}
+    return reports
+
+
+def submission_rates(program_ids, days):
+    """
+    {program id: [(date, submissions), ...]} for each of the last days,
+    days without submissions included as 0
+    """
+    today = timezone.localdate()
+    first = today - datetime.timedelta(days=days - 1)
+    rows = (
+        StudentAssignment.objects.filter(
+            assignment__program_id__in=program_ids, submitted__gte=day_start(first)
+        )
+        .annotate(day=TruncDate("submitted"))
+        .order_by()
+        .values_list("assignment__program_id", "day")
+        .annotate(count=Count("id"))
+    )
+    counts = {(program_id, day): count for program_id, day, count in rows}
+    dates = [first + datetime.timedelta(days=i) for i in range(days)]
+    return {
+        pk: [(day, counts.get((pk, day), 0)) for day in dates] for pk in program_ids
+    }
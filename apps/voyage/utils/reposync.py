@@ -0,0 +1,301 @@
+"""
+reposync.py
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import os
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.text import slugify
+
+from ..models import (
+    GradingQueueItem,
+    StudentAssignment,
+    StudentCourseRepo,
+    StudentProgress,
+    StudentGradeSummary,
+    AssignmentGradeSummary,
+    FacultyGradeSummary,
+)
+from .batch import chunked
+from .cache import invalidate_pages
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimited(Exception):
+    """
+    The backend refuses requests until reset, a unix timestamp
+    """
+
+    def __init__(self, reset):
+        super().__init__(f"Rate limited until {reset}")
+        self.reset = reset
+
+
+class RepoBackend(ABC):
+    """
+    Where student repos are read from. Each assignment is the directory of
+    its content name, slugified, in the student's course repo.
+    """
+
+    @abstractmethod
+    async def head(self, repo, etag):
+        """
+        (changed, etag) of the repo's default branch, changed being False
+        when etag still matches
+        """
+
+    @abstractmethod
+    async def last_commit(self, repo, path):
+        """
+        Time of the latest commit touching path, None if there is none
+        """
+
+    @staticmethod
+    def owner_name(repo):
+        """
+        (owner, name) of a https://host/owner/name repo url
+        """
+        owner, name = urllib.parse.urlsplit(repo).path.strip("/").split("/")[:2]
+        return owner, name.removesuffix(".git")
+
+
+class LocalGitBackend(RepoBackend):
+    """
+    Bare repositories under root, as <root>/<owner>/<name>.git
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    async def git(self, repo, *args):
+        """
+        Output of a git command run on the bare repo, None when it fails
+        """
+        owner, name = self.owner_name(repo)
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            "--git-dir",
+            os.path.join(self.root, owner, f"{name}.git"),
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+        if process.returncode:
+            return None
+        return stdout.decode().strip()
+
+    async def head(self, repo, etag):
+        sha = await self.git(repo, "rev-parse", "--verify", "--quiet", "HEAD")
+        if not sha:
+            return False, etag
+        return sha != etag, sha
+
+    async def last_commit(self, repo, path):
+        date = await self.git(repo, "log", "-1", "--format=%cI", "HEAD", "--", path)
+        if not date:
+            return None
+        return datetime.datetime.fromisoformat(date)
+
+
+class HttpBackend(RepoBackend):
+    """
+    GitHub REST compatible commits API at url. Heads are requested with
+    If-None-Match, so unchanged repos cost a 304 that GitHub does not count
+    against the rate limit. Requests stop once the limit is spent.
+    """
+
+    def __init__(self, url="https://api.github.com", token=None, timeout=10):
+        self.url = url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.reset = 0
+
+    def request(self, repo, params, etag=None):
+        """
+        Blocking GET of the commits of repo, returns (status, headers, body)
+        """
+        if self.reset > time.time():
+            raise RateLimited(self.reset)
+        owner, name = self.owner_name(repo)
+        request = urllib.request.Request(
+            f"{self.url}/repos/{owner}/{name}/commits?{urllib.parse.urlencode(params)}",
+            headers={"Accept": "application/vnd.github+json"},
+        )
+        if self.token:
+            request.add_header("Authorization", f"Bearer {self.token}")
+        if etag:
+            request.add_header("If-None-Match", etag)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                status, headers, body = (
+                    response.status,
+                    response.headers,
+                    response.read(),
+                )
+        except urllib.error.HTTPError as exc:
+            status, headers, body = exc.code, exc.headers, b""
+        if headers.get("X-RateLimit-Remaining") == "0":
+            self.reset = int(headers.get("X-RateLimit-Reset", time.time() + 60))
+        if status in (403, 429) and self.reset > time.time():
+            raise RateLimited(self.reset)
+        return status, headers, body
+
+    async def head(self, repo, etag):
+        status, headers, _ = await asyncio.to_thread(
+            self.request, repo, {"per_page": 1}, etag
+        )
+        if status != 200:
+            return False, etag
+        return True, headers.get("ETag", "")
+
+    async def last_commit(self, repo, path):
+        status, _, body = await asyncio.to_thread(
+            self.request, repo, {"path": path, "per_page": 1}
+        )
+        if status != 200:
+            return None
+        commits = json.loads(body)
+        if not commits:
+            return None
+        date = commits[0]["commit"]["committer"]["date"]
+        return datetime.datetime.fromisoformat(date.replace("Z", "+00:00"))
+
+
+def repo_backend():
+    """
+    Backend configured by REPO_SYNC_BACKEND and its REPO_SYNC_OPTIONS
+    """
+    backend = import_string(
+        getattr(settings, "REPO_SYNC_BACKEND", "apps.voyage.utils.reposync.HttpBackend")
+    )
+    return backend(**getattr(settings, "REPO_SYNC_OPTIONS", {}))
+
+
+async def check_repo(backend, semaphore, repo, pending):
+    """
+    (repo, {student assignment id: submitted}) for the pending assignments,
+    [(id, path), ...], committed to since the etag of repo. None when the
+    repo could not be read, it is retried on the next run.
+    """
+    async with semaphore:
+        try:
+            changed, etag = await backend.head(repo.repo, repo.etag)
+            if not changed:
+                return repo, {}
+            submitted = {}
+            for pk, path in pending:
+                date = await backend.last_commit(repo.repo, path)
+                if date is not None:
+                    submitted[pk] = date
+        except RateLimited:
+            return None
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("repo sync failed repo=%s error=%r", repo.repo, exc)
+            return None
+        # Only remembered once every pending path has been read
+        repo.etag = etag
+        return repo, submitted
+
+
+async def check_repos(backend, pending, concurrency):
+    """
+    check_repo over {repo: pending}, at most concurrency at a time
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(
+        *(check_repo(backend, semaphore, repo, i) for repo, i in pending.items())
+    )
+    return [result for result in results if result is not None]
+
+
+def pending_submissions(repos):
+    """
+    {repo: [(student assignment id, path), ...]} of the unsubmitted
+    assignments of repos, and their {student assignment id: (assignment id,
+    reviewer id)}, in one query
+    """
+    by_pair = {(repo.student_id, repo.course_id): repo for repo in repos}
+    rows = StudentAssignment.objects.filter(
+        submitted__isnull=True,
+        student__in={repo.student_id for repo in repos},
+        assignment__course__in={repo.course_id for repo in repos},
+    ).values_list(
+        "id",
+        "student_id",
+        "assignment_id",
+        "reviewer_id",
+        "assignment__course_id",
+        "assignment__content__name",
+    )
+    pending, keys = {}, {}
+    for pk, student_id, assignment_id, reviewer_id, course_id, name in rows.iterator():
+        repo = by_pair.get((student_id, course_id))
+        if repo is not None:
+            pending.setdefault(repo, []).append((pk, slugify(name)))
+            keys[pk] = (assignment_id, reviewer_id)
+    return pending, keys
+
+
+def sync_repos(repos=None, backend=None, concurrency=None, chunk_size=500):
+    """
+    Sets submitted on the unsubmitted assignments whose directory received
+    a commit. Repos without pending assignments are not requested at all.
+    Returns (repos checked, assignments submitted).
+    """
+    backend = backend or repo_backend()
+    concurrency = concurrency or getattr(settings, "REPO_SYNC_CONCURRENCY", 16)
+    if repos is None:
+        repos = StudentCourseRepo.objects.all()
+    repos = repos.order_by("id")
+    checked = submitted = 0
+    students, assignments, reviewers = set(), set(), set()
+    for chunk in chunked(repos.iterator(chunk_size=chunk_size), chunk_size):
+        pending, keys = pending_submissions(chunk)
+        if not pending:
+            continue
+        results = asyncio.run(check_repos(backend, pending, concurrency))
+        now = timezone.now()
+        rows = [
+            StudentAssignment(id=pk, submitted=date, dtm_updated=now)
+            for _, dates in results
+            for pk, date in dates.items()
+        ]
+        StudentAssignment.objects.bulk_update(
+            rows, ["submitted", "dtm_updated"], batch_size=1000
+        )
+        StudentCourseRepo.objects.bulk_update(
+            [repo for repo, _ in results], ["etag"], batch_size=1000
+        )
+        GradingQueueItem.sync([row.id for row in rows])
+        StudentProgress.sync([row.id for row in rows])
+        checked += len(results)
+        submitted += len(rows)
+        for repo, dates in results:
+            if dates:
+                students.add(repo.student_id)
+                for pk in dates:
+                    assignment_id, reviewer_id = keys[pk]
+                    assignments.add(assignment_id)
+                    if reviewer_id is not None:
+                        reviewers.add(reviewer_id)
+    if students:
+        # bulk_update sends no signals
+        StudentGradeSummary.rebuild(students)
+        AssignmentGradeSummary.rebuild(assignments)
+        if reviewers:
+            FacultyGradeSummary.rebuild(reviewers)
+        invalidate_pages()
+    return checked, submitted
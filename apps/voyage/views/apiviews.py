@@ -0,0 +1,313 @@
+"""
+api views
+"""
+
+import hashlib
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import generics, status, viewsets
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import BasePermission, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..models import (
+    Faculty,
+    Program,
+    Course,
+    Student,
+    Assignment,
+    StudentAssignment,
+    GradingQueueItem,
+    StudentProgress,
+)
+from ..serializers import (
+    ClaimSerializer,
+    GradeSerializer,
+    GradingQueueItemSerializer,
+    ProgramSerializer,
+    CourseSerializer,
+    StudentSerializer,
+    AssignmentSerializer,
+    StudentAssignmentSerializer,
+    StudentProgressSerializer,
+)
+from ..utils.cache import page_version
+from ..utils.grading import CLAIMED, ClaimedError, apply_grades, check_grades
+from ..utils.reports import cached_report
+
+
+class IsFaculty(BasePermission):
+    """
+    Allows active faculty only
+    """
+
+    def has_permission(self, request, view):
+        return Faculty.objects.filter(user=request.user, is_active=True).exists()
+
+
+class BulkGradeView(APIView):
+    """
+    Grades many StudentAssignments in one request
+    """
+
+    permission_classes = [IsAuthenticated, IsFaculty]
+    max_rows = 10000
+
+    def post(self, request, *args, **kwargs):
+        """
+        Accepts a list of {student_assignment_id, grade, feedback}
+        """
+        serializer = GradeSerializer(
+            data=request.data, many=True, max_length=self.max_rows
+        )
+        serializer.is_valid(raise_exception=True)
+        rows = serializer.validated_data
+        faculty = Faculty.objects.get(user=request.user)
+        errors = check_grades(rows, faculty)
+        if not errors:
+            try:
+                return Response({"updated": apply_grades(rows, faculty)})
+            except ClaimedError as exc:
+                # Claimed between the check and the write, nothing written
+                errors = {
+                    i: CLAIMED
+                    for i, row in enumerate(rows)
+                    if row["student_assignment_id"] in exc.ids
+                }
+        return Response(
+            {"errors": [{"index": i, "detail": e} for i, e in errors.items()]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Cursor pagination in id order
+    """
+
+    ordering = "id"
+    page_size = 100
+    max_page_size = 1000
+    page_size_query_param = "page_size"
+
+
+class QueuePagination(IdCursorPagination):
+    """
+    Cursor pagination in grading priority order
+    """
+
+    ordering = GradingQueueItem.PRIORITY
+
+
+class GradingQueueView(generics.ListAPIView):
+    """
+    Grading queue of the requesting faculty, earliest due date first, then
+    the longest waiting submission. Reviewers pull work by claiming it.
+    """
+
+    permission_classes = [IsAuthenticated, IsFaculty]
+    pagination_class = QueuePagination
+    serializer_class = GradingQueueItemSerializer
+
+    def get_queryset(self):
+        return GradingQueueItem.objects.filter(faculty__user=self.request.user)
+
+    def post(self, request, *args, **kwargs):
+        """
+        Claims the next {count} unclaimed submissions, 204 when none is left
+        """
+        serializer = ClaimSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        faculty = Faculty.objects.get(user=request.user)
+        claimed = GradingQueueItem.claim(faculty, serializer.validated_data["count"])
+        if not claimed:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(
+            StudentAssignmentSerializer(
+                claimed, many=True, context={"request": request}
+            ).data
+        )
+
+
+class StudentProgressView(APIView):
+    """
+    Progress timeline of a student in due date order, with totals per
+    status. Read from the materialised timeline in one range scan of its
+    index. Students read their own, staff and faculty anyone's.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, student_id=None):
+        """
+        Timeline of student_id, or of the requesting student
+        """
+        own = (
+            Student.objects.filter(user=request.user)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if student_id is None:
+            if own is None:
+                raise NotFound("No student for this user")
+            student_id = own
+        elif student_id != own and not (
+            request.user.is_staff or IsFaculty().has_permission(request, self)
+        ):
+            raise PermissionDenied()
+        now = timezone.now()
+        timeline = StudentProgressSerializer(
+            StudentProgress.objects.filter(student=student_id).order_by("due", "id"),
+            many=True,
+            context={"now": now},
+        ).data
+        counts = dict.fromkeys(
+            (
+                StudentProgress.ON_TIME,
+                StudentProgress.LATE,
+                StudentProgress.MISSING,
+                StudentProgress.PENDING,
+            ),
+            0,
+        )
+        graded = 0
+        for entry in timeline:
+            counts[entry["status"]] += 1
+            graded += entry["grade"] is not None
+        return Response(
+            {
+                "student": student_id,
+                "counts": {**counts, "graded": graded},
+                "timeline": timeline,
+            }
+        )
+
+
+class ReportView(APIView):
+    """
+    Report precomputed by the report tasks, read from the cache without
+    touching the database. 404 until a task has stored it.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminUser | IsFaculty]
+    # report name and the model its pk comes from
+    reports = {"grades": Course, "backlog": Faculty, "submissions": Program}
+
+    def get(self, request, name, pk):
+        """
+        Report name of the Course, Faculty or Program pk
+        """
+        if name not in self.reports:
+            raise NotFound(f"No report {name}")
+        report = cached_report(name, pk)
+        if report is None:
+            raise NotFound("Report not computed yet")
+        return Response({"report": name, "id": pk, **report})
+
+
+class ReadOnlyVoyageViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Read only API with sparse fieldsets and conditional GET.
+
+    The ETag is the request path at the page version, which every save
+    and delete of a rendered model moves on, so unchanged data answers 304
+    without a query.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminUser | IsFaculty]
+    pagination_class = IdCursorPagination
+    filter_fields = ()
+
+    def get_queryset(self):
+        """
+        Filtered by filter_fields, joined for the requested fields only
+        """
+        queryset = self.queryset.all()
+        for name in self.filter_fields:
+            if name in self.request.query_params:
+                try:
+                    queryset = queryset.filter(
+                        **{name: self.request.query_params[name]}
+                    )
+                except (ValueError, DjangoValidationError) as exc:
+                    raise ValidationError({name: "Invalid id"}) from exc
+        related = self.serializer_class.select_related_for(self.request)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(request, super().retrieve, *args, **kwargs)
+
+    @staticmethod
+    def conditional(request, render, *args, **kwargs):
+        """
+        304 when the client copy is current, otherwise render with the ETag
+        """
+        etag = quote_etag(
+            hashlib.md5(
+                f"{request.get_full_path()}|{page_version()}".encode(),
+                usedforsecurity=False,
+            ).hexdigest()
+        )
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = render(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
+
+
+class ProgramViewSet(ReadOnlyVoyageViewSet):
+    """
+    Programs
+    """
+
+    queryset = Program.objects.all()
+    serializer_class = ProgramSerializer
+
+
+class CourseViewSet(ReadOnlyVoyageViewSet):
+    """
+    Courses
+    """
+
+    queryset = Course.objects.all()
+    serializer_class = CourseSerializer
+
+
+class StudentViewSet(ReadOnlyVoyageViewSet):
+    """
+    Students
+    """
+
+    queryset = Student.objects.all()
+    serializer_class = StudentSerializer
+    filter_fields = ("program",)
+
+
+class AssignmentViewSet(ReadOnlyVoyageViewSet):
+    """
+    Assignments
+    """
+
+    queryset = Assignment.objects.all()
+    serializer_class = AssignmentSerializer
+    filter_fields = ("program", "course")
+
+
+class StudentAssignmentViewSet(ReadOnlyVoyageViewSet):
+    """
+    StudentAssignments
+    """
+
+    queryset = StudentAssignment.objects.all()
+    serializer_class = StudentAssignmentSerializer
+    filter_fields = ("student", "assignment", "reviewer")
@@ -3,11 +3,35 @@ views
 """
 
 from typing import Any
-from django.views.generic import TemplateView, ListView, DetailView
-from django.shortcuts import redirect, render
+from django.db.models import Avg, Count
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.generic import TemplateView, ListView, DetailView, View
+from django.shortcuts import get_object_or_404, redirect, render
 from qux.seo.mixin import SEOMixin
-from ..models import Faculty, Student, StudentAssignment, Course, Assignment
-from ..forms import CreateCourseForm, CreateAssignmentForm
+from ..models import (
+    Faculty,
+    Student,
+    StudentAssignment,
+    Course,
+    Assignment,
+    AssignmentGradeSummary,
+)
+from ..forms import (
+    CreateCourseForm,
+    CreateAssignmentForm,
+    GradebookExportForm,
+    GradeStatisticsForm,
+)
+from ..utils.analytics import grade_array, grade_statistics
+from ..utils.gradebook import (
+    GRADEBOOK_FORMATS,
+    gradebook_rows,
+    iter_csv,
+    iter_parquet,
+)
+from .shared import DisplayRelationsMixin, KeysetPaginationMixin, PageCacheMixin
 
 
 class VoyageDefaultView(SEOMixin, TemplateView):
@@ -18,13 +42,16 @@ class VoyageDefaultView(SEOMixin, TemplateView):
     template_name = "voyage/base.html"
 
 
-class FacultiesView(SEOMixin, ListView):
+class FacultiesView(PageCacheMixin, SEOMixin, KeysetPaginationMixin, ListView):
     """
     Faculty list
     """
 
     model = Faculty
+    template_name = "voyage/faculty_list.html"
     context_object_name = "faculty"
+    queryset = Faculty.objects.select_related("user")
+    page_cache_models = (Faculty,)
 
 
 class FacultyDetailView(DetailView):
@@ -36,50 +63,52 @@ class FacultyDetailView(DetailView):
     template_name = "voyage/faculty_detail.html"
 
 
-class NumberStudentsView(ListView):
+class NumberStudentsView(DisplayRelationsMixin, ListView):
     """
     NumberStudents View
     """
 
-    model = Course
+    model = Student
     template_name = "voyage/common_list.html"
+    context_object_name = "context"
+    select_related = ("user",)
 
-    def get_context_data(self, **kwargs):
+    def get_queryset(self):
         """
-        returns context data
+        students of the course
         """
-        course = Course.objects.get(id=self.kwargs["pk"])
-        context = super().get_context_data(**kwargs)
-        context["context"] = course.students()
-        print(context)
-        return context
+        course = get_object_or_404(Course, id=self.kwargs["pk"])
+        return super().get_queryset() & course.students()
 
 
-class FacultyAssignments(ListView):
+class FacultyAssignments(DisplayRelationsMixin, ListView):
     """
     FacultyAssignments view
     """
 
-    model = Course
+    model = Assignment
     template_name = "voyage/common_list.html"
     context_object_name = "context"
+    select_related = ("content",)
 
-    def get_queryset(self, *args, **kwargs):
+    def get_queryset(self):
         """
         gets queryset
         """
-        course = Course.objects.get(id=self.kwargs["pk"])
-        queryset = course.assignments()
-        return queryset
+        course = get_object_or_404(Course, id=self.kwargs["pk"])
+        return super().get_queryset() & course.assignments()
 
 
-class StudentsView(SEOMixin, ListView):
+class StudentsView(PageCacheMixin, SEOMixin, KeysetPaginationMixin, ListView):
     """
     Students list
     """
 
     model = Student
+    template_name = "voyage/student_list.html"
     context_object_name = "student"
+    queryset = Student.objects.select_related("user")
+    page_cache_models = (Student,)
 
 
 class StudentDetailView(DetailView):
@@ -89,73 +118,82 @@ class StudentDetailView(DetailView):
 
     model = Student
     template_name = "voyage/student_detail.html"
+    queryset = Student.objects.select_related("user")
 
     def get_context_data(self, **kwargs):
         """
-        gets context
+        gets context, assignments grouped by course with submission statistics
         """
         context = super().get_context_data(**kwargs)
-        courses = self.object.courses()
-        assignments = self.object.assignments()
-        dicn = {}
-        for i in courses:
-            dicn[i] = assignments.filter(course=i)
-        context["assignments"] = dicn
-        print(context)
+        stats = {
+            i["assignment__course"]: i
+            for i in StudentAssignment.objects.filter(student=self.object)
+            .order_by()
+            .values("assignment__course")
+            .annotate(
+                submitted=Count("submitted"),
+                graded=Count("grade"),
+                avg_grade=Avg("grade"),
+            )
+        }
+        courses = {}
+        for i in (
+            self.object.assignments()
+            .select_related("course", "content")
+            .order_by("course__name", "id")
+        ):
+            if i.course_id not in courses:
+                course_stats = stats.get(i.course_id, {})
+                courses[i.course_id] = {
+                    "course": i.course,
+                    "assignments": [],
+                    "submitted": course_stats.get("submitted", 0),
+                    "graded": course_stats.get("graded", 0),
+                    "avg_grade": course_stats.get("avg_grade") or 0,
+                }
+            courses[i.course_id]["assignments"].append(i)
+        context["courses"] = list(courses.values())
         return context
 
 
-class StudentsAssignments(ListView):
+class StudentsAssignments(DisplayRelationsMixin, ListView):
     """
     StudentsAssignments view
     """
 
-    model = Course
+    model = Assignment
     template_name = "voyage/common_list.html"
     context_object_name = "context"
+    select_related = ("content",)
 
-    def get_queryset(self, *args, **kwargs):
+    def get_queryset(self):
         """
         gets queryset
         """
-        course = Course.objects.get(id=self.kwargs["course_id"])
-        student = Student.objects.get(id=self.kwargs["student_id"])
-        assignments = student.assignments().filter(course=course)
-        return assignments
+        course = get_object_or_404(Course, id=self.kwargs["course_id"])
+        student = get_object_or_404(Student, id=self.kwargs["student_id"])
+        return super().get_queryset() & student.assignments().filter(course=course)
 
 
-class AssignmentView(SEOMixin, ListView):
+class AssignmentView(PageCacheMixin, SEOMixin, ListView):
     """
     Assignment detail
     """
 
     model = Assignment
     template_name = "voyage/assignment_list.html"
+    context_object_name = "assignments"
+    paginate_by = 50
+    page_cache_models = (Assignment, AssignmentGradeSummary)
 
-    def get_context_data(self, **kwargs):
+    def get_queryset(self):
         """
-        gets context
+        Reads grade and submission statistics from the grade summaries
         """
-        context = super().get_context_data(**kwargs)
-        assignments = Assignment.objects.all()
-        dicn = {}
-        for i in assignments:
-            submissions = i.submissions(graded=True)
-            if submissions:
-                grades = [int(i.grade) for i in submissions]
-                avg = sum(grades) / len(grades)
-                dicn[i] = [avg]
-            else:
-                dicn[i] = [0]
-            dicn[i].append(
-                StudentAssignment.objects.filter(assignment=i, submitted__isnull=False)
-            )
-        context["assignments"] = dicn
-        print(context)
-        return context
+        return Assignment.objects.select_related("grade_summary").order_by("id")
 
 
-class SubmissionsView(ListView):
+class SubmissionsView(KeysetPaginationMixin, DisplayRelationsMixin, ListView):
     """
     Submissions view
     """
@@ -164,6 +202,8 @@ class SubmissionsView(ListView):
     template_name = "voyage/submissions.html"
     context_object_name = "studentassignments"
     queryset = StudentAssignment.objects.filter(submitted__isnull=False)
+    select_related = ("student__user", "assignment")
+    keyset_ordering = ("submitted", "id")
 
 
 class CreateNewCourse(TemplateView):
@@ -216,3 +256,67 @@ class CreateNewAssignment(TemplateView):
             form.save()
             return redirect("home")
         return render(request, self.template_name, {"form": form})
+
+
+@method_decorator(staff_member_required, name="dispatch")
+class GradebookExportView(View):
+    """
+    Streams the gradebook as CSV or Parquet
+    """
+
+    def get(self, request, *args, **kwargs):
+        """
+        get method
+        """
+        form = GradebookExportForm(request.GET)
+        if not form.is_valid():
+            return HttpResponseBadRequest(
+                form.errors.as_text(), content_type="text/plain"
+            )
+        data = form.cleaned_data
+        rows = gradebook_rows(
+            program=data["program"],
+            course=data["course"],
+            start=data["start"],
+            end=data["end"],
+        )
+        content_type, extension = GRADEBOOK_FORMATS[data["format"]]
+        if data["format"] == "parquet":
+            content = iter_parquet(rows)
+        else:
+            content = iter_csv(rows)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="gradebook.{extension}"'
+        )
+        return response
+
+
+@method_decorator(staff_member_required, name="dispatch")
+class GradeStatisticsView(SEOMixin, TemplateView):
+    """
+    Grade distribution of a program, course or assignment
+    """
+
+    template_name = "voyage/grade_statistics.html"
+    num_students = 20
+
+    def get_context_data(self, **kwargs):
+        """
+        Computes the statistics from one query over the selected grades
+        """
+        context = super().get_context_data(**kwargs)
+        form = GradeStatisticsForm(self.request.GET)
+        scope = form.cleaned_data if form.is_valid() else {}
+        stats = grade_statistics(grade_array(**scope))
+        ranked = stats["students"][: self.num_students]
+        students = Student.objects.select_related("user").in_bulk(
+            [i[0] for i in ranked]
+        )
+        context["form"] = form
+        context["stats"] = stats
+        context["students"] = [
+            {"student": students.get(pk), "avg": avg, "zscore": zscore, "rank": rank}
+            for pk, avg, zscore, rank in ranked
+        ]
+        return context
@@ -0,0 +1,180 @@
+"""
+shared
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Max, Q
+from django.http import Http404, HttpResponse
+from htmlmin.middleware import HtmlMinifyMiddleware
+
+from ..utils.cache import page_version
+
+
+class KeysetPaginationMixin:
+    """
+    Cursor (keyset) pagination for list views.
+
+    Rows after the cursor are found with a range filter on keyset_ordering
+    instead of an OFFSET, so page N costs the same as page 1. The ordering
+    fields must be non null model fields, the last one unique.
+    """
+
+    keyset_ordering = ("id",)
+    keyset_page_size = 50
+    cursor_kwarg = "cursor"
+
+    def get_queryset(self):
+        """
+        One page of rows after the cursor
+        """
+        queryset = super().get_queryset().order_by(*self.keyset_ordering)
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if cursor:
+            queryset = queryset.filter(self.keyset_filter(self.decode_cursor(cursor)))
+        rows = list(queryset[: self.keyset_page_size + 1])
+        self.next_cursor = None
+        if len(rows) > self.keyset_page_size:
+            rows = rows[: self.keyset_page_size]
+            self.next_cursor = self.encode_cursor(rows[-1])
+        return rows
+
+    def get_context_data(self, **kwargs):
+        """
+        Adds the cursors to the context
+        """
+        context = super().get_context_data(**kwargs)
+        context["cursor"] = self.request.GET.get(self.cursor_kwarg)
+        context["next_cursor"] = self.next_cursor
+        return context
+
+    def keyset_filter(self, values):
+        """
+        Rows strictly after values in keyset_ordering
+        """
+        condition = None
+        for field, value in reversed(list(zip(self.keyset_ordering, values))):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            after = Q(**{f"{name}__{lookup}": value})
+            condition = (
+                after if condition is None else after | (Q(**{name: value}) & condition)
+            )
+        return condition
+
+    def encode_cursor(self, obj):
+        """
+        Opaque cursor for the rows after obj
+        """
+        values = [getattr(obj, field.lstrip("-")) for field in self.keyset_ordering]
+        data = json.dumps(values, default=str).encode()
+        return base64.urlsafe_b64encode(data).decode()
+
+    def decode_cursor(self, cursor):
+        """
+        Ordering values from a cursor, 404 when it is not valid
+        """
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            fields = [
+                self.model._meta.get_field(field.lstrip("-"))
+                for field in self.keyset_ordering
+            ]
+            if len(values) != len(fields):
+                raise ValueError(cursor)
+            return [field.to_python(value) for field, value in zip(fields, values)]
+        except (binascii.Error, ValueError, TypeError, ValidationError) as exc:
+            raise Http404("Invalid cursor") from exc
+
+
+class DisplayRelationsMixin:
+    """
+    Loads the relations a list template displays together with its rows.
+
+    Views declare them in select_related and prefetch_related instead of
+    leaving the template to fetch each row's foreign keys one query at a
+    time. Views narrowing the rows start from super().get_queryset().
+    """
+
+    select_related = ()
+    prefetch_related = ()
+
+    def get_queryset(self):
+        """
+        The rows with their display relations
+        """
+        queryset = super().get_queryset()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+class PageCacheMixin:
+    """
+    Caches the rendered, minified page of a GET.
+
+    The key carries the latest dtm_updated of every model in
+    page_cache_models, one seek of its dtm_updated index, and the page
+    version deletes move on. Any save, create or delete moves the page to
+    a new key and stale entries expire unused. Set page_cache_per_role when
+    the page differs for anonymous, logged in and staff users.
+    """
+
+    page_cache_models = ()
+    page_cache_per_role = False
+    page_cache_timeout = None
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Serves the cached page, or renders, minifies and caches it
+        """
+        if request.method != "GET":
+            return super().dispatch(request, *args, **kwargs)
+        key = self.page_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response.minify_response = False
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200 or response.streaming or response.cookies:
+            return response
+        if hasattr(response, "render"):
+            response.render()
+        # Minify now so the cache holds what the middleware would send
+        HtmlMinifyMiddleware(None).process_response(request, response)
+        response.minify_response = False
+        timeout = self.page_cache_timeout
+        if timeout is None:
+            timeout = getattr(settings, "PAGE_CACHE_TIMEOUT", 300)
+        cache.set(key, (response.content, response["Content-Type"]), timeout)
+        return response
+
+    def page_cache_key(self, request):
+        """
+        Cache key of the page at the current version of its models
+        """
+        parts = [request.get_full_path(), str(page_version())]
+        for model in self.page_cache_models:
+            updated = model.objects.aggregate(updated=Max("dtm_updated"))["updated"]
+            parts.append(f"{model._meta.label}:{updated}")
+        if self.page_cache_per_role:
+            user = request.user
+            if user.is_staff:
+                parts.append("staff")
+            elif user.is_authenticated:
+                parts.append("user")
+            else:
+                parts.append("anonymous")
+        digest = hashlib.md5("|".join(parts).encode()).hexdigest()
+        return f"voyage:page:{self.__class__.__name__}:{digest}"
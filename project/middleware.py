@@ -0,0 +1,149 @@
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecorder:
+    """
+    execute_wrapper counting and timing the queries of one request
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.templates = Counter()
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.templates[sql] += 1
+            if not many:
+                self.statements[(sql, repr(params))] += 1
+
+    @property
+    def duplicates(self):
+        """
+        Number of queries repeating an earlier query with the same params
+        """
+        return sum(count - 1 for count in self.statements.values())
+
+    def repeated(self, threshold):
+        """
+        (sql, count) of templates run more than threshold times, likely N+1
+        """
+        return [
+            (sql, count) for sql, count in self.templates.items() if count > threshold
+        ]
+
+
+class RecordedStream:
+    """
+    Streaming content that calls finish once the server closes it, so the
+    queries run while the body is iterated are recorded too
+    """
+
+    def __init__(self, content, finish):
+        self.content = iter(content)
+        self.finish = finish
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.content)
+
+    def close(self):
+        """
+        Called by the server after the last chunk, or when the client left
+        """
+        self.finish()
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Per request query count, database time, duplicate queries and wall time,
+    sent as a Server-Timing header and a log line. Templates repeated more
+    than QUERY_NPLUSONE_THRESHOLD times are logged as likely N+1 queries.
+
+    A streamed body is iterated after the headers are sent. Its queries are
+    in the log line, written when the stream closes, but not in the header.
+    Async streams are iterated outside this thread's connections and are
+    not recorded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, "QUERY_NPLUSONE_THRESHOLD", 10)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        stack = ExitStack()
+        try:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        except BaseException:
+            stack.close()
+            raise
+        duration = time.perf_counter() - start
+        streamed = response.streaming and not response.is_async
+        if streamed:
+            # The recorder stays attached until the server closes the stream
+
+            def finish():
+                stack.close()
+                self.log(request, response, recorder, time.perf_counter() - start)
+
+            response.streaming_content = RecordedStream(
+                response.streaming_content, finish
+            )
+        else:
+            stack.close()
+
+        timing = (
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries", '
+            f"app;dur={duration * 1000:.1f}"
+        )
+        if response.has_header("Server-Timing"):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+        if not streamed:
+            self.log(request, response, recorder, duration)
+        return response
+
+    def log(self, request, response, recorder, duration):
+        """
+        Logs the stats of the request and its likely N+1 queries
+        """
+        stats = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": recorder.count,
+            "duplicates": recorder.duplicates,
+            "db_ms": round(recorder.duration * 1000, 1),
+            "app_ms": round(duration * 1000, 1),
+        }
+        logger.info(
+            " ".join(f"{key}={value}" for key, value in stats.items()), extra=stats
+        )
+        for sql, count in recorder.repeated(self.threshold):
+            logger.warning(
+                "n+1 method=%s path=%s repeated=%d sql=%s",
+                request.method,
+                request.path,
+                count,
+                sql,
+            )
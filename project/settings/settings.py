@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "project.middleware.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -116,6 +117,55 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+ROSTER_CACHE_TIMEOUT = int(os.getenv("ROSTER_CACHE_TIMEOUT", "3600"))
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "300"))
+
+# Precomputed reports, written by celery so CACHES must be shared with it
+REPORT_CHUNK_SIZE = int(os.getenv("REPORT_CHUNK_SIZE", "100"))
+REPORT_DAYS = int(os.getenv("REPORT_DAYS", "90"))
+REPORT_LOCK_TIMEOUT = int(os.getenv("REPORT_LOCK_TIMEOUT", "600"))
+REPORT_CACHE_TIMEOUT = None
+
+# Celery beat
+CELERYBEAT_SCHEDULE = {
+    "voyage-precompute-reports": {
+        "task": "apps.voyage.tasks.precompute_reports",
+        "schedule": int(os.getenv("REPORT_INTERVAL", "900")),
+    },
+    "voyage-sync-student-repos": {
+        "task": "apps.voyage.tasks.sync_student_repos",
+        "schedule": int(os.getenv("REPO_SYNC_INTERVAL", "600")),
+    },
+}
+
+# Student repo sync, the local backend reads bare repos under REPO_SYNC_ROOT
+if os.getenv("REPO_SYNC_ROOT"):
+    REPO_SYNC_BACKEND = "apps.voyage.utils.reposync.LocalGitBackend"
+    REPO_SYNC_OPTIONS = {"root": os.getenv("REPO_SYNC_ROOT")}
+else:
+    REPO_SYNC_BACKEND = "apps.voyage.utils.reposync.HttpBackend"
+    REPO_SYNC_OPTIONS = {
+        "url": os.getenv("REPO_SYNC_URL", "https://api.github.com"),
+        "token": os.getenv("REPO_SYNC_TOKEN"),
+    }
+REPO_SYNC_CONCURRENCY = int(os.getenv("REPO_SYNC_CONCURRENCY", "16"))
+
+# Seconds before an ungraded claim on the grading queue lapses
+GRADING_CLAIM_TIMEOUT = int(os.getenv("GRADING_CLAIM_TIMEOUT", "1800"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -199,6 +249,25 @@ GRAPH_MODELS = {
     "rankdir": "BT",
 }
 
+# Query instrumentation
+QUERY_NPLUSONE_THRESHOLD = int(os.getenv("QUERY_NPLUSONE_THRESHOLD", "10"))
+
+# Logging, the query instrumentation logs a line per request at INFO
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "project.middleware": {
+            "handlers": ["console"],
+            "level": os.getenv("QUERY_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 # Django Debug Toolbar
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -12,7 +12,8 @@ urlpatterns = [
     path("impersonate/", include("impersonate.urls")),
     path("", include("qux.auth.urls.appurls", namespace="qux_auth")),
     path("", TemplateView.as_view(template_name="qjango.html"), name="home"),
-    path("voyage/",include('apps.voyage.urls.appurls'))
+    path("voyage/",include('apps.voyage.urls.appurls')),
+    path("api/voyage/", include("apps.voyage.urls.apiurls")),
 ]
 
 if settings.DEBUG and ("debug_toolbar" in settings.INSTALLED_APPS):